@@ -84,6 +84,32 @@ class S3Client:
             LOG.exception("S3 get_object failed")
             raise
 
+    def download_to_buffer(self, key: str, bucket: Optional[str] = None, out: Optional[bytearray] = None) -> memoryview:
+        """
+        Download an object into a buffer sized from ContentLength and return a memoryview of its bytes.
+
+        Pass a bytearray as `out` to reuse it across calls (e.g. when polling the same object); it is used
+        when large enough, otherwise a new buffer is allocated. The returned view aliases that buffer.
+        """
+        target_bucket = bucket or self.bucket
+        if not target_bucket:
+            raise ValueError("No target S3 bucket specified")
+        try:
+            resp = self.s3.get_object(Bucket=target_bucket, Key=key)
+            size = resp["ContentLength"]
+            buf = out if out is not None and len(out) >= size else bytearray(size)
+            view = memoryview(buf)[:size]
+            pos = 0
+            for chunk in resp["Body"].iter_chunks(chunk_size=1024 * 1024):
+                view[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+            return view
+        except self.s3.exceptions.NoSuchKey:
+            raise
+        except botocore.exceptions.BotoCoreError:
+            LOG.exception("S3 get_object failed")
+            raise
+
     def list_objects(self, prefix: Optional[str] = None, bucket: Optional[str] = None, max_keys: int = 1000) -> List[Dict[str, Any]]:
         """
         List objects in a bucket optionally filtering by prefix. Returns a list
@@ -118,6 +144,42 @@ class S3Client:
             LOG.exception("S3 delete_object failed")
             raise
 
+    def head_object(self, key: str, bucket: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch object metadata without the body. Returns the head_object response, or None if the key does not exist.
+        """
+        target_bucket = bucket or self.bucket
+        if not target_bucket:
+            raise ValueError("No target S3 bucket specified")
+        try:
+            return self.s3.head_object(Bucket=target_bucket, Key=key)
+        except botocore.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        except botocore.exceptions.BotoCoreError:
+            LOG.exception("S3 head_object failed")
+            raise
+
+    def delete_objects(self, keys: List[str], bucket: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Delete up to 1000 objects in a single DeleteObjects request. Returns the response dict,
+        whose "Errors" list names any keys that could not be deleted.
+        """
+        target_bucket = bucket or self.bucket
+        if not target_bucket:
+            raise ValueError("No target S3 bucket specified")
+        if len(keys) > 1000:
+            raise ValueError("delete_objects accepts at most 1000 keys per call")
+        try:
+            return self.s3.delete_objects(
+                Bucket=target_bucket,
+                Delete={"Objects": [{"Key": k} for k in keys], "Quiet": True},
+            )
+        except botocore.exceptions.BotoCoreError:
+            LOG.exception("S3 delete_objects failed")
+            raise
+
     def generate_presigned_url(self, key: str, bucket: Optional[str] = None, expires_in: int = 3600, http_method: str = "GET") -> str:
         """
         Generate a presigned URL for GET/PUT operations on an object.
@@ -50,6 +50,14 @@ def default_dynamo_table() -> Optional[str]:
     return get_env("DEFAULT_DYNAMO_TABLE")
 
 
+def http_pool_size() -> int:
+    """
+    Max pooled HTTP connections per client (DATAMCP_HTTP_POOL_SIZE, default 50).
+    Should be at least the number of threads that share one client.
+    """
+    return int(get_env("DATAMCP_HTTP_POOL_SIZE", "50"))
+
+
 def aws_credentials_dict() -> dict:
     """
     Return a credentials dict suitable for passing to boto3.client/resource
@@ -66,3 +74,19 @@ def aws_credentials_dict() -> dict:
     if region:
         creds["region_name"] = region
     return creds
+
+
+def tool_workers() -> int:
+    """
+    Threads used by MCP tools that fan out over many keys (DATAMCP_WORKERS, default 32),
+    capped at http_pool_size() so workers never wait on a free pooled connection.
+    """
+    return min(int(get_env("DATAMCP_WORKERS", "32")), http_pool_size())
+
+
+def warm_clients_enabled() -> bool:
+    """
+    Whether the server builds its cloud clients in the background at startup (DATAMCP_WARM_CLIENTS,
+    default off). Off keeps startup free of SDK imports for sessions that never use S3/DynamoDB/GCS.
+    """
+    return (get_env("DATAMCP_WARM_CLIENTS", "") or "").lower() in ("1", "true", "yes")
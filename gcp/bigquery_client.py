@@ -4,72 +4,179 @@ BigQuery helper for DataMCP
 Purpose:
 - Focused wrapper for Google BigQuery operations used by MCP tools and AI agents.
 - Exposes single-purpose methods with clear semantics:
-  - run_query(sql, job_config=None, timeout=300) -> job_id
+  - run_query(sql, job_config=None, timeout=300, reuse_job=False) -> job_id
   - get_query_results(job_id, max_results=1000) -> rows (list of dicts) or iterator
+  - get_query_results_arrow(job_id) -> pyarrow.Table (columnar; needs pyarrow)
+  - iter_query_results_dataframes(job_id, page_size=10000) -> iterator of pandas.DataFrame chunks
   - create_dataset(dataset_id, exists_ok=True)
   - delete_dataset(dataset_id, delete_contents=False)
   - create_table(table_ref or table_id, schema, exists_ok=True)
   - list_datasets() -> List[str]
   - list_tables(dataset_id) -> List[str]
+  - list_all_tables(dataset_ids=None, max_workers=8) -> Dict[str, List[str]]
 - Designed for tools that need programmatic BigQuery access analogous to Athena/Redshift.
 
 Usage example:
     from gcp.bigquery_client import BigQueryClient
-    bq = BigQueryClient(project="my-project")
+    bq = BigQueryClient(project="my-project")  # or credentials_path="sa.json" to skip credential discovery
     job_id = bq.run_query("SELECT 1 as x")
     rows = bq.get_query_results(job_id)
 
 Design notes for AI/MCP tools:
 - This wrapper uses google-cloud-bigquery. The runtime environment must have google-cloud-bigquery installed and credentials available.
-- run_query returns the job id (string). get_query_results returns a list of dict rows (uses row.to_dict()).
+- run_query returns the job id (string). get_query_results returns a list of dict rows, built by a converter
+  generated once per result schema (positional lookups instead of per-row key resolution).
+- run_query enables BigQuery's server-side query cache (use_query_cache=True) unless the job_config says otherwise,
+  and remembers the job id of identical SELECTs without a destination table (same SQL + job config) for
+  query_cache_ttl seconds. With reuse_job=True (opt-in) a retried call returns that finished job instead of
+  submitting again; only use it where results up to query_cache_ttl old are acceptable.
 - Methods raise exceptions from the underlying library; calling tools should catch, audit, and sanitize outputs before exposing to agents.
+- When orjson is installed (pip install "data-mcp-server[fast]"), REST responses (including result rows) are decoded
+  with orjson instead of the stdlib json module; without it the library default is used.
 """
 
 from __future__ import annotations
+import copy
+import functools
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterator
 
 # google bigquery libs (ensure installed in runtime)
 try:
     from google.cloud import bigquery  # type: ignore
     from google.auth.exceptions import DefaultCredentialsError  # type: ignore
+    from google.oauth2 import service_account  # type: ignore
 except Exception:  # pragma: no cover
     bigquery = None  # type: ignore
     DefaultCredentialsError = Exception  # type: ignore
+    service_account = None  # type: ignore
+
+# optional fast JSON decoding of REST payloads
+try:
+    import orjson  # type: ignore
+    import google.auth as google_auth  # type: ignore
+    from google.auth.credentials import with_scopes_if_required  # type: ignore
+    from google.auth.transport.requests import AuthorizedSession  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 LOG = logging.getLogger(__name__)
 
+# largest page the list endpoints serve; fewer pages means fewer sequential round-trips
+LIST_PAGE_SIZE = 1000
+# number of remembered SQL -> job id entries for run_query
+QUERY_CACHE_SIZE = 1024
+
+
+if orjson is not None:
+    class _OrjsonSession(AuthorizedSession):
+        """
+        AuthorizedSession whose responses decode JSON with orjson.
+        google-cloud-core parses every API response via response.json(), so this covers row payloads too.
+        """
+
+        def request(self, *args, **kwargs):
+            resp = super().request(*args, **kwargs)
+            resp.json = lambda **_: orjson.loads(resp.content)
+            return resp
+
+
+@functools.lru_cache(maxsize=None)
+def _load_service_account_credentials(path: str) -> Any:
+    """
+    Load (once per path) service account credentials scoped for BigQuery.
+    """
+    return service_account.Credentials.from_service_account_file(path, scopes=bigquery.Client.SCOPE)
+
+
+def _compile_row_fn(names: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Generate a function that turns a Row into a dict with positional lookups,
+    e.g. names ("a", "b") -> lambda r: {"a": r[0], "b": r[1]}.
+    Column names are embedded via repr(), so any name yields a valid literal.
+    """
+    items = ", ".join(f"{name!r}: r[{i}]" for i, name in enumerate(names))
+    namespace: Dict[str, Any] = {}
+    exec(f"def _row_to_dict(r):\n    return {{{items}}}\n", namespace)
+    return namespace["_row_to_dict"]
+
 
 class BigQueryClient:
     """
     Minimal BigQuery wrapper.
 
     Methods:
-    - run_query(sql: str, job_config: Optional[bigquery.QueryJobConfig] = None, timeout: int = 300) -> str
+    - run_query(sql: str, job_config: Optional[bigquery.QueryJobConfig] = None, timeout: int = 300, reuse_job: bool = False) -> str
     - get_query_results(job_id: str, max_results: int = 1000) -> List[Dict[str, Any]]
+    - get_query_results_arrow(job_id: str, max_results: Optional[int] = None) -> pyarrow.Table
+    - iter_query_results_dataframes(job_id: str, page_size: int = 10000) -> Iterator[pandas.DataFrame]
     - create_dataset(dataset_id: str, exists_ok: bool = True) -> Dict[str, Any]
     - delete_dataset(dataset_id: str, delete_contents: bool = False) -> None
     - create_table(table_id: str, schema: List[bigquery.SchemaField], exists_ok: bool = True) -> Dict[str, Any]
     - list_datasets() -> List[str]
     - list_tables(dataset_id: str) -> List[str]
+    - list_all_tables(dataset_ids: Optional[List[str]] = None, max_workers: int = 8) -> Dict[str, List[str]]
     """
 
-    def __init__(self, project: Optional[str] = None, client: Optional[Any] = None):
+    def __init__(
+        self,
+        project: Optional[str] = None,
+        client: Optional[Any] = None,
+        fast_json: bool = True,
+        bqstorage_client: Optional[Any] = None,
+        query_cache_ttl: float = 300,
+        credentials: Optional[Any] = None,
+        credentials_path: Optional[str] = None,
+    ):
         """
         Args:
             project: optional default GCP project id
             client: optional bigquery.Client instance for testing or custom credentials
+            fast_json: decode REST responses with orjson when it is installed
+            bqstorage_client: optional BigQueryReadClient used by the Arrow/DataFrame result methods
+            query_cache_ttl: seconds a finished SELECT job is reused for identical run_query calls (0 disables)
+            credentials: optional google.auth credentials; skips Application Default Credentials discovery
+            credentials_path: optional service account JSON file, loaded once per path and shared across clients
         """
         if bigquery is None:
             raise RuntimeError("google-cloud-bigquery is not available. Install google-cloud-bigquery package.")
         try:
-            self.client = client or bigquery.Client(project=project)
+            if client is None and credentials is None and credentials_path:
+                credentials = _load_service_account_credentials(credentials_path)
+            self.client = client or self._build_client(project, fast_json, credentials)
         except DefaultCredentialsError:
             LOG.exception("Failed to initialize BigQuery client - credentials not found")
             raise
         self.project = project
+        self._bqstorage = bqstorage_client
+        self.query_cache_ttl = query_cache_ttl
+        self._query_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # row -> dict converters keyed by result schema column names
+        self._row_fn_cache: Dict[Tuple[str, ...], Callable[[Any], Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _build_client(project: Optional[str], fast_json: bool, credentials: Optional[Any] = None):
+        use_orjson = fast_json and orjson is not None
+        if credentials is None:
+            if not use_orjson:
+                return bigquery.Client(project=project)
+            credentials, default_project = google_auth.default(scopes=bigquery.Client.SCOPE)
+            project = project or default_project
+        else:
+            project = project or getattr(credentials, "project_id", None)
+        if not use_orjson:
+            return bigquery.Client(project=project, credentials=credentials)
+        credentials = with_scopes_if_required(credentials, bigquery.Client.SCOPE)
+        return bigquery.Client(project=project, credentials=credentials, _http=_OrjsonSession(credentials))
 
-    def run_query(self, sql: str, job_config: Optional[Any] = None, timeout: int = 300) -> str:
+    def run_query(self, sql: str, job_config: Optional[Any] = None, timeout: int = 300, reuse_job: bool = False) -> str:
         """
         Run a query asynchronously and return the job id.
 
@@ -77,18 +184,74 @@ class BigQueryClient:
             sql: SQL string to execute
             job_config: optional bigquery.QueryJobConfig
             timeout: seconds to wait for job to start (not total query runtime)
+            reuse_job: return the job id of an identical, recently finished SELECT instead of resubmitting
+                       (opt-in: the reused job may predate writes made since it ran)
 
         Returns:
             job_id (str)
         """
+        job_config = self._with_query_cache(job_config)
+        cache_key = self._query_cache_key(sql, job_config)
+        if reuse_job and self.query_cache_ttl > 0:
+            cached_job_id = self._cached_job_id(cache_key)
+            if cached_job_id is not None:
+                return cached_job_id
         try:
             job = self.client.query(sql, job_config=job_config)
             # job.job_id is the id; wait for job to start/complete if needed externally
             job.result(timeout=timeout)  # wait for completion up to timeout
-            return job.job_id
         except Exception:
             LOG.exception("BigQuery run_query failed")
             raise
+        # only plain reads are safe to hand back again; DML/DDL and SELECTs writing to a destination
+        # table must run every time
+        if (
+            self.query_cache_ttl > 0
+            and getattr(job, "statement_type", None) == "SELECT"
+            and getattr(job_config, "destination", None) is None
+        ):
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = job.job_id
+                self._query_cache.move_to_end(cache_key)
+                while len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        return job.job_id
+
+    @staticmethod
+    def _with_query_cache(job_config: Optional[Any]) -> Any:
+        """
+        Return a job config with use_query_cache enabled unless the caller set it explicitly.
+        The caller's config object is never mutated.
+        """
+        if job_config is None:
+            return bigquery.QueryJobConfig(use_query_cache=True)
+        if job_config.use_query_cache is None:
+            job_config = copy.deepcopy(job_config)
+            job_config.use_query_cache = True
+        return job_config
+
+    @staticmethod
+    def _query_cache_key(sql: str, job_config: Any) -> str:
+        config_repr = json.dumps(job_config.to_api_repr(), sort_keys=True, default=str)
+        return hashlib.blake2b(sql.encode("utf-8") + config_repr.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cached_job_id(self, cache_key: str) -> Optional[str]:
+        with self._query_cache_lock:
+            job_id = self._query_cache.get(cache_key)
+            if job_id is None:
+                return None
+            self._query_cache.move_to_end(cache_key)
+        try:
+            job = self.client.get_job(job_id)
+        except Exception:
+            LOG.debug("Cached BigQuery job %s no longer available", job_id, exc_info=True)
+            job = None
+        if job is not None and job.state == "DONE" and job.error_result is None and job.ended is not None:
+            if (datetime.now(timezone.utc) - job.ended).total_seconds() < self.query_cache_ttl:
+                return job_id
+        with self._query_cache_lock:
+            self._query_cache.pop(cache_key, None)
+        return None
 
     def get_query_results(self, job_id: str, max_results: int = 1000) -> List[Dict[str, Any]]:
         """
@@ -104,18 +267,44 @@ class BigQueryClient:
         try:
             job = self.client.get_job(job_id)
             iterator = job.result(max_results=max_results)
-            rows: List[Dict[str, Any]] = []
-            for row in iterator:
-                try:
-                    rows.append(dict(row))
-                except Exception:
-                    # fallback: convert fields manually
-                    rows.append({k: getattr(row, k) for k in row._field_names})  # type: ignore
-            return rows
+            names = tuple(field.name for field in iterator.schema)
+            row_fn = self._row_fn_cache.get(names)
+            if row_fn is None:
+                row_fn = self._row_fn_cache.setdefault(names, _compile_row_fn(names))
+            return [row_fn(row) for row in iterator]
         except Exception:
             LOG.exception("BigQuery get_query_results failed for job %s", job_id)
             raise
 
+    def get_query_results_arrow(self, job_id: str, max_results: Optional[int] = None) -> Any:
+        """
+        Fetch results for a given job id as a pyarrow.Table.
+
+        Uses the BigQuery Storage API when available (google-cloud-bigquery-storage), which streams
+        Arrow record batches instead of JSON rows. Callers that need JSON can convert slices lazily
+        with table.slice(offset, length).to_pylist().
+        """
+        try:
+            job = self.client.get_job(job_id)
+            iterator = job.result(max_results=max_results)
+            return iterator.to_arrow(bqstorage_client=self._bqstorage, create_bqstorage_client=self._bqstorage is None)
+        except Exception:
+            LOG.exception("BigQuery get_query_results_arrow failed for job %s", job_id)
+            raise
+
+    def iter_query_results_dataframes(self, job_id: str, page_size: int = 10000) -> Iterator[Any]:
+        """
+        Yield results for a given job id as a sequence of pandas.DataFrame chunks (requires pandas and pyarrow),
+        so large results can be processed without materializing every row at once.
+        """
+        try:
+            job = self.client.get_job(job_id)
+            iterator = job.result(page_size=page_size)
+            yield from iterator.to_dataframe_iterable(bqstorage_client=self._bqstorage)
+        except Exception:
+            LOG.exception("BigQuery iter_query_results_dataframes failed for job %s", job_id)
+            raise
+
     def create_dataset(self, dataset_id: str, exists_ok: bool = True) -> Dict[str, Any]:
         """
         Create a dataset. dataset_id may be 'project.dataset' or 'dataset' if project provided.
@@ -156,7 +345,7 @@ class BigQueryClient:
         List datasets in the configured project.
         """
         try:
-            datasets = [d.dataset_id for d in self.client.list_datasets()]
+            datasets = [d.dataset_id for d in self.client.list_datasets(page_size=LIST_PAGE_SIZE)]
             return datasets
         except Exception:
             LOG.exception("BigQuery list_datasets failed")
@@ -168,8 +357,21 @@ class BigQueryClient:
         """
         try:
             ds_ref = dataset_id if "." in dataset_id else f"{self.project}.{dataset_id}" if self.project else dataset_id
-            tables = [t.table_id for t in self.client.list_tables(ds_ref)]
+            tables = [t.table_id for t in self.client.list_tables(ds_ref, page_size=LIST_PAGE_SIZE)]
             return tables
         except Exception:
             LOG.exception("BigQuery list_tables failed for dataset %s", dataset_id)
             raise
+
+    def list_all_tables(self, dataset_ids: Optional[List[str]] = None, max_workers: int = 8) -> Dict[str, List[str]]:
+        """
+        List tables for several datasets (all datasets in the project by default).
+        Page tokens chain within one listing, so the parallelism is across datasets.
+        """
+        if dataset_ids is None:
+            dataset_ids = self.list_datasets()
+        if not dataset_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(dataset_ids))) as pool:
+            results = pool.map(self.list_tables, dataset_ids)
+            return dict(zip(dataset_ids, results))
@@ -2,16 +2,18 @@
 GCP IAM / Service Account helpers for DataMCP
 
 Purpose:
-- Provide focused helpers to manage service accounts and IAM bindings via `gcloud` CLI.
-- Return structured results (CommandResult-like dicts) and rely on `tools/runner.run_cmd` for safe execution and dry-run support.
+- Provide focused helpers to manage service accounts and IAM bindings.
+- Calls the IAM / Cloud Resource Manager REST APIs over a single google-auth AuthorizedSession
+  that is reused across calls; the `gcloud` CLI path (via `tools/runner.run_cmd`) is kept behind use_gcloud=True.
 - Designed for MCP tools that need to create SA, generate keys, and grant roles.
 
-Why use gcloud:
-- Creating service accounts and keys is commonly done with `gcloud` in CI/automation contexts.
-- Using `gcloud` avoids adding complex google-api client wiring and keeps behavior reproducible.
+Why REST instead of gcloud:
+- Every `gcloud` call forks a new Python process and re-authenticates, which costs seconds per call.
+- A persistent AuthorizedSession keeps the token and the HTTPS connection warm between calls.
 
 Prereqs:
-- `gcloud` must be installed and authenticated on the host where these helpers run.
+- google-auth (with requests) installed and Application Default Credentials available,
+  or `gcloud` installed and authenticated when use_gcloud=True.
 - For automated CI, use Workload Identity or service account with limited scope.
 
 Usage (example):
@@ -23,57 +25,175 @@ Usage (example):
 Design notes for AI/MCP tools:
 - All methods accept dry_run: True by default to prevent accidental modifications.
 - Methods return dict: { "rc": int, "stdout": str, "stderr": str, "cmd": str }
+  For REST calls "cmd" is the HTTP method and URL, and "stdout" the JSON response body.
 - Callers should persist audit logs and mask secrets (service account keys) before exposing outputs.
 """
 
 from __future__ import annotations
+import base64
 import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import time
+from typing import Optional, Dict, Any, Callable, List, Tuple
 
 from tools.runner import run_cmd, CommandResult
 
+# google-auth is only needed for the REST path
+try:
+    import google.auth as google_auth  # type: ignore
+    from google.auth.transport.requests import AuthorizedSession  # type: ignore
+except Exception:  # pragma: no cover - import errors handled at runtime
+    google_auth = None  # type: ignore
+    AuthorizedSession = None  # type: ignore
+
 LOG = logging.getLogger(__name__)
 
+IAM_API = "https://iam.googleapis.com/v1"
+CRM_API = "https://cloudresourcemanager.googleapis.com/v1"
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
 
 class GCPIAM:
     """
-    Helper wrapper that uses `gcloud` to manage IAM/service accounts.
+    Helper wrapper that manages IAM/service accounts via the REST APIs (or `gcloud` when use_gcloud=True).
 
     Methods:
     - create_service_account(project, sa_id, display_name, dry_run=True) -> dict
     - delete_service_account(project, sa_email, dry_run=True) -> dict
     - create_service_account_key(sa_email, key_output_path=None, dry_run=True) -> dict
     - add_iam_policy_binding(project, member, role, dry_run=True) -> dict
+    - add_iam_policy_bindings(project, bindings, dry_run=True) -> dict
     - remove_iam_policy_binding(project, member, role, dry_run=True) -> dict
     """
 
-    def __init__(self, gcloud_bin: str = "gcloud"):
+    def __init__(self, gcloud_bin: str = "gcloud", use_gcloud: bool = False, session: Optional[Any] = None):
+        """
+        Args:
+            gcloud_bin: gcloud executable used when use_gcloud=True.
+            use_gcloud: shell out to gcloud instead of calling the REST APIs.
+            session: optional AuthorizedSession (or compatible) for testing or custom credentials.
+        """
         self.gcloud = gcloud_bin
+        self.use_gcloud = use_gcloud
+        self._http = session
+
+    def _session(self):
+        """
+        Return the shared AuthorizedSession, creating it on first use so dry runs need no credentials.
+        """
+        if self._http is None:
+            if google_auth is None or AuthorizedSession is None:
+                raise RuntimeError("google-auth is not available. Install google-auth[requests] or pass use_gcloud=True.")
+            creds, _ = google_auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+            self._http = AuthorizedSession(creds)
+        return self._http
+
+    def _request(self, method: str, url: str, body: Optional[Dict[str, Any]] = None, dry_run: bool = True,
+                 on_success: Optional[Callable[[Dict[str, Any]], str]] = None) -> Dict[str, Any]:
+        """
+        Issue a REST call and shape the outcome like a CommandResult dict.
+        on_success may replace the stdout rendering of the JSON response (e.g. to keep key material out of it).
+        """
+        cmd = f"{method} {url}"
+        if dry_run:
+            rendered = f" {json.dumps(body)}" if body is not None else ""
+            return {"rc": 0, "stdout": f"[dry_run] {cmd}{rendered}", "stderr": "", "cmd": cmd}
+        try:
+            resp = self._session().request(method, url, json=body)
+        except Exception as exc:
+            LOG.exception("IAM request failed: %s", cmd)
+            return {"rc": 1, "stdout": "", "stderr": str(exc), "cmd": cmd}
+        return self._shape(cmd, resp, on_success)
+
+    @staticmethod
+    def _shape(cmd: str, resp: Any, on_success: Optional[Callable[[Dict[str, Any]], str]] = None) -> Dict[str, Any]:
+        if not resp.ok:
+            LOG.error("IAM request failed: %s (status=%s)", cmd, resp.status_code)
+            return {"rc": 1, "stdout": "", "stderr": resp.text, "cmd": cmd}
+        data = resp.json() if resp.content else {}
+        stdout = on_success(data) if on_success else json.dumps(data)
+        return {"rc": 0, "stdout": stdout, "stderr": "", "cmd": cmd}
+
+    def _run_gcloud(self, cmd: list, dry_run: bool) -> Dict[str, Any]:
+        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
+        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+
+    def _modify_policy(self, project: str, mutate: Callable[[Dict[str, Any]], None], dry_run: bool = True,
+                       max_retries: int = 5, backoff: float = 0.5) -> Dict[str, Any]:
+        """
+        Read-modify-write the project IAM policy with one getIamPolicy + one setIamPolicy.
+        A concurrent writer makes setIamPolicy fail with 409 (etag mismatch); the whole
+        read-modify-write is then retried with exponential backoff.
+        """
+        get_url = f"{CRM_API}/projects/{project}:getIamPolicy"
+        set_url = f"{CRM_API}/projects/{project}:setIamPolicy"
+        cmd = f"POST {set_url}"
+        if dry_run:
+            return {"rc": 0, "stdout": f"[dry_run] POST {get_url} && POST {set_url}", "stderr": "", "cmd": cmd}
+        attempt = 0
+        while True:
+            current = self._request("POST", get_url, body={"options": {"requestedPolicyVersion": 3}}, dry_run=False)
+            if current["rc"] != 0:
+                return current
+            policy = json.loads(current["stdout"])
+            policy.setdefault("bindings", [])
+            mutate(policy)
+            try:
+                resp = self._session().request("POST", set_url, json={"policy": policy, "updateMask": "bindings,etag"})
+            except Exception as exc:
+                LOG.exception("IAM request failed: %s", cmd)
+                return {"rc": 1, "stdout": "", "stderr": str(exc), "cmd": cmd}
+            if resp.status_code == 409 and attempt < max_retries:
+                delay = backoff * (2 ** attempt)
+                LOG.warning("setIamPolicy etag conflict for %s, retrying in %.1fs", project, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return self._shape(cmd, resp)
 
     def create_service_account(self, project: str, sa_id: str, display_name: str, dry_run: bool = True) -> Dict[str, Any]:
         """
         Create a service account.
         sa_id: short id (no @), result email: {sa_id}@{project}.iam.gserviceaccount.com
         """
-        cmd = [self.gcloud, "iam", "service-accounts", "create", sa_id, "--project", project, "--display-name", display_name]
-        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
-        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+        if self.use_gcloud:
+            cmd = [self.gcloud, "iam", "service-accounts", "create", sa_id, "--project", project, "--display-name", display_name]
+            return self._run_gcloud(cmd, dry_run)
+        body = {"accountId": sa_id, "serviceAccount": {"displayName": display_name}}
+        return self._request("POST", f"{IAM_API}/projects/{project}/serviceAccounts", body=body, dry_run=dry_run)
 
     def delete_service_account(self, project: str, sa_email: str, dry_run: bool = True) -> Dict[str, Any]:
         """
         Delete a service account by email (full resource).
         """
-        cmd = [self.gcloud, "iam", "service-accounts", "delete", sa_email, "--project", project, "--quiet"]
-        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
-        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+        if self.use_gcloud:
+            cmd = [self.gcloud, "iam", "service-accounts", "delete", sa_email, "--project", project, "--quiet"]
+            return self._run_gcloud(cmd, dry_run)
+        return self._request("DELETE", f"{IAM_API}/projects/{project}/serviceAccounts/{sa_email}", dry_run=dry_run)
 
     def create_service_account_key(self, sa_email: str, key_output_path: Optional[str] = None, dry_run: bool = True) -> Dict[str, Any]:
         """
         Create a key for the service account.
-        If key_output_path is provided, the key JSON will be written there by gcloud.
+        If key_output_path is provided, the key JSON is written there and stdout only carries the key name;
+        otherwise the key JSON is returned in stdout.
         Returns stdout/stderr; callers should securely handle/download the file.
         """
+        if not self.use_gcloud:
+            def render_key(data: Dict[str, Any]) -> str:
+                key_json = base64.b64decode(data.get("privateKeyData", "")).decode("utf-8")
+                if not key_output_path:
+                    return key_json
+                # private key material: owner-only, like gcloud's key files (the umask can't widen it)
+                fd = os.open(key_output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                if hasattr(os, "fchmod"):
+                    os.fchmod(fd, 0o600)  # O_CREAT's mode does not apply to a pre-existing file
+                with open(fd, "w", encoding="utf-8") as f:
+                    f.write(key_json)
+                return json.dumps({"name": data.get("name"), "keyFile": key_output_path})
+
+            url = f"{IAM_API}/projects/-/serviceAccounts/{sa_email}/keys"
+            return self._request("POST", url, body={}, dry_run=dry_run, on_success=render_key)
         cmd = [self.gcloud, "iam", "service-accounts", "keys", "create"]
         if key_output_path:
             cmd += [key_output_path]
@@ -82,8 +202,7 @@ class GCPIAM:
             # Safer to require a path, but we provide default temp-file behavior not implemented here.
             cmd += ["-"]
         cmd += ["--iam-account", sa_email]
-        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
-        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+        return self._run_gcloud(cmd, dry_run)
 
     def add_iam_policy_binding(self, project: str, member: str, role: str, dry_run: bool = True) -> Dict[str, Any]:
         """
@@ -91,14 +210,52 @@ class GCPIAM:
         member examples: "serviceAccount:sa@project.iam.gserviceaccount.com", "user:foo@example.com", "group:..."
         role example: "roles/storage.admin"
         """
-        cmd = [self.gcloud, "projects", "add-iam-policy-binding", project, "--member", member, "--role", role]
-        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
-        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+        return self.add_iam_policy_bindings(project, [(member, role)], dry_run=dry_run)
+
+    def add_iam_policy_bindings(self, project: str, bindings: List[Tuple[str, str]], dry_run: bool = True) -> Dict[str, Any]:
+        """
+        Add several (member, role) bindings to the project in a single policy update.
+        The policy is fetched once, all bindings are merged in memory (deduplicated per role),
+        and written back with one setIamPolicy call.
+        """
+        if self.use_gcloud:
+            results = [
+                self._run_gcloud([self.gcloud, "projects", "add-iam-policy-binding", project, "--member", m, "--role", r], dry_run)
+                for m, r in bindings
+            ]
+            return {
+                "rc": max((res["rc"] for res in results), default=0),
+                "stdout": "\n".join(res["stdout"] for res in results),
+                "stderr": "\n".join(res["stderr"] for res in results if res["stderr"]),
+                "cmd": " && ".join(res["cmd"] for res in results),
+            }
+
+        def add(policy: Dict[str, Any]) -> None:
+            by_role = {b.get("role"): b for b in policy["bindings"] if "condition" not in b}
+            for member, role in bindings:
+                binding = by_role.get(role)
+                if binding is None:
+                    binding = {"role": role, "members": []}
+                    policy["bindings"].append(binding)
+                    by_role[role] = binding
+                members = binding.setdefault("members", [])
+                if member not in members:
+                    members.append(member)
+
+        return self._modify_policy(project, add, dry_run=dry_run)
 
     def remove_iam_policy_binding(self, project: str, member: str, role: str, dry_run: bool = True) -> Dict[str, Any]:
         """
         Remove an IAM policy binding from the project.
         """
-        cmd = [self.gcloud, "projects", "remove-iam-policy-binding", project, "--member", member, "--role", role]
-        res: CommandResult = run_cmd(cmd, dry_run=dry_run)
-        return {"rc": res.returncode, "stdout": res.stdout, "stderr": res.stderr, "cmd": res.cmd}
+        if self.use_gcloud:
+            cmd = [self.gcloud, "projects", "remove-iam-policy-binding", project, "--member", member, "--role", role]
+            return self._run_gcloud(cmd, dry_run)
+
+        def remove(policy: Dict[str, Any]) -> None:
+            for binding in policy["bindings"]:
+                if binding.get("role") == role and "condition" not in binding and member in binding.get("members", []):
+                    binding["members"].remove(member)
+            policy["bindings"] = [b for b in policy["bindings"] if b.get("members")]
+
+        return self._modify_policy(project, remove, dry_run=dry_run)
@@ -16,13 +16,22 @@ Usage:
 Design notes for AI/MCP tools:
 - This wrapper uses google-cloud-secret-manager. Runtime must have the library installed and credentials available.
 - access_secret returns the secret payload as a string.
+- Reads are cached in-process: "latest" for cache_ttl seconds (default 300) so rotations still propagate,
+  pinned versions without expiry (LRU-bounded) since they are immutable. add_secret_version/delete_secret
+  and invalidate(secret_name) drop cached entries for that secret.
+- Concurrent misses for the same version share one fetch; the fetch runs outside the cache lock, so
+  hits and other secrets are never blocked behind a network call.
 - Methods raise exceptions from the underlying client; calling code should catch, audit, and sanitize outputs before exposing to agents.
 """
 
 from __future__ import annotations
 import logging
+import threading
+from concurrent.futures import Future
 from typing import Optional, Dict, Any
 
+from cachetools import LRUCache, TTLCache
+
 # Google libs (ensure installed in runtime)
 try:
     from google.cloud import secretmanager  # type: ignore
@@ -43,13 +52,22 @@ class GCPSecretManager:
     - create_secret(parent: str, secret_id: str, replication: Dict[str, Any]) -> Dict[str, Any]
     - add_secret_version(secret_name: str, payload: str) -> Dict[str, Any]
     - delete_secret(secret_name: str) -> None
+    - invalidate(secret_name: str) -> None
     """
 
-    def __init__(self, project: Optional[str] = None, client: Optional[Any] = None):
+    def __init__(
+        self,
+        project: Optional[str] = None,
+        client: Optional[Any] = None,
+        cache_ttl: float = 300,
+        cache_maxsize: int = 1024,
+    ):
         """
         Args:
             project: optional default project id to use when creating secrets.
             client: optional secretmanager client for testing or custom credentials.
+            cache_ttl: seconds a "latest" payload is served from cache (0 disables caching of "latest").
+            cache_maxsize: maximum number of cached payloads, per cache ("latest" and pinned versions).
         """
         if secretmanager is None:
             raise RuntimeError("google-cloud-secret-manager not available. Install google-cloud-secret-manager package.")
@@ -59,6 +77,12 @@ class GCPSecretManager:
             LOG.exception("Failed to initialize Secret Manager client - credentials not found")
             raise
         self.project = project
+        self._cache_lock = threading.RLock()
+        self._latest_cache: Optional[TTLCache] = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl) if cache_ttl > 0 else None
+        # explicit versions never change, so they are cached without expiry (least recently used evicted first)
+        self._pinned_cache: LRUCache = LRUCache(maxsize=cache_maxsize)
+        # version name -> Future of the fetch in flight for it
+        self._inflight: Dict[str, Future] = {}
 
     def access_secret(self, secret_name: str, version: str = "latest") -> str:
         """
@@ -76,13 +100,55 @@ class GCPSecretManager:
             google.api_core.exceptions.GoogleAPICallError (or underlying) on failure.
         """
         name = self._full_name(secret_name, version)
+        cache = self._latest_cache if version == "latest" else self._pinned_cache
+        with self._cache_lock:
+            if cache is not None:
+                cached = cache.get(name)
+                if cached is not None:
+                    return cached
+            fut = self._inflight.get(name)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[name] = Future()
+        if not owner:
+            # another thread is already fetching this version; share its result
+            return fut.result()
+
         try:
             response = self.client.access_secret_version(name=name)
             payload = response.payload.data.decode("utf-8")
-            return payload
-        except Exception:
+        except Exception as exc:
             LOG.exception("GCP Secret Manager access_secret failed for %s", name)
+            with self._cache_lock:
+                if self._inflight.get(name) is fut:
+                    del self._inflight[name]
+            fut.set_exception(exc)
             raise
+        with self._cache_lock:
+            # skip caching if invalidate() ran while we were fetching
+            if self._inflight.get(name) is fut:
+                del self._inflight[name]
+                if cache is not None:
+                    cache[name] = payload
+        fut.set_result(payload)
+        return payload
+
+    def invalidate(self, secret_name: str) -> None:
+        """
+        Drop every cached version of a secret so the next access_secret call refetches it.
+
+        Args:
+            secret_name: full resource name or short id (project required).
+        """
+        prefix = f"{self._secret_path(secret_name)}/versions/"
+        with self._cache_lock:
+            for key in [k for k in self._inflight if k.startswith(prefix)]:
+                del self._inflight[key]
+            for cache in (self._latest_cache, self._pinned_cache):
+                if cache is None:
+                    continue
+                for key in [k for k in cache if k.startswith(prefix)]:
+                    cache.pop(key, None)
 
     def create_secret(self, parent: str, secret_id: str, replication: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -124,6 +190,7 @@ class GCPSecretManager:
                 parent = f"projects/{self.project}/secrets/{secret_name}"
             payload_bytes = payload.encode("utf-8")
             resp = self.client.add_secret_version(parent=parent, payload={"data": payload_bytes})
+            self.invalidate(parent)
             return {"name": resp.name}
         except Exception:
             LOG.exception("GCP Secret Manager add_secret_version failed for %s", secret_name)
@@ -139,6 +206,7 @@ class GCPSecretManager:
         try:
             name = secret_name if secret_name.startswith("projects/") else f"projects/{self.project}/secrets/{secret_name}"
             self.client.delete_secret(name=name)
+            self.invalidate(name)
         except Exception:
             LOG.exception("GCP Secret Manager delete_secret failed for %s", secret_name)
             raise
@@ -147,8 +215,14 @@ class GCPSecretManager:
         """
         Build a full resource name for secret version.
         """
+        return f"{self._secret_path(secret_name)}/versions/{version}"
+
+    def _secret_path(self, secret_name: str) -> str:
+        """
+        Build a full resource name for the secret itself.
+        """
         if secret_name.startswith("projects/"):
-            return f"{secret_name}/versions/{version}"
+            return secret_name
         if self.project is None:
             raise ValueError("Project not configured; provide full secret resource name or set project in constructor.")
-        return f"projects/{self.project}/secrets/{secret_name}/versions/{version}"
+        return f"projects/{self.project}/secrets/{secret_name}"
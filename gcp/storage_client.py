@@ -3,7 +3,8 @@ GCP Cloud Storage helper for DataMCP
 
 Purpose:
 - Focused wrapper for Google Cloud Storage operations used by MCP tools and AI agents.
-- Exposes single-purpose methods with clear semantics: upload_bytes, upload_fileobj, download_to_bytesio, list_blobs, delete_blob, generate_signed_url.
+- Exposes single-purpose methods with clear semantics: upload_bytes, upload_fileobj, download_to_buffer, download_parallel,
+  download_to_bytesio, iter_blobs, list_blobs, delete_blob, delete_blobs, generate_signed_url.
 - Designed for tools that need object storage access analogous to AWS S3.
 
 Usage example:
@@ -11,29 +12,137 @@ Usage example:
     gcs = GCSClient(bucket="my-bucket")
     gcs.upload_bytes(b"payload", "path/to/obj")
     bio = gcs.download_to_bytesio("path/to/obj")
+    view = gcs.download_to_buffer("path/to/obj", out=reusable_bytearray)
 
 Design notes for AI/MCP tools:
 - This wrapper uses the google-cloud-storage library. The runtime environment must have the
   google-cloud-storage package and credentials available (Application Default Credentials or a service account).
 - generate_signed_url will attempt to use service account credentials to sign URLs; if not possible an error is raised.
+  Identical requests within a short window (at most 60s, and at most a tenth of expires_in) reuse the same URL.
+- Uploads at or above MultipartConfig.threshold (32 MiB by default) use the XML multipart upload API: parts are
+  PUT in parallel straight from a memoryview of the payload (BytesIO buffer or mmap of a real file), then committed;
+  a failed upload is aborted so no orphaned parts are left behind.
+- download_parallel fetches large objects as concurrent ranged GETs written straight into slices of one buffer;
+  keep concurrency within the HTTP pool size (DATAMCP_HTTP_POOL_SIZE) or requests will queue for connections.
+- iter_blobs streams listing results page by page (optionally fetching the next page in the background), so memory
+  stays bounded by page_size regardless of bucket size; list_blobs materializes the same stream into a list.
+- delete_blobs issues the deletes concurrently over the shared connection pool. It is not transactional: each
+  key succeeds or fails on its own and is reported individually.
+- aupload_bytes, adownload_to_buffer, alist_blobs and adelete_blobs are awaitable variants for asyncio callers
+  (e.g. async MCP tools); they run the sync method on a worker thread and share the same client and connection pool.
 - Methods raise exceptions from the underlying library; callers should catch, audit, and sanitize outputs before exposing to agents.
 """
 
 from __future__ import annotations
+import asyncio
+import contextlib
 import io
 import logging
-from typing import Optional, List, Dict, Any
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from urllib.parse import quote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from cachetools import TTLCache
 
 # google cloud libraries (ensure installed in runtime environment)
 try:
     from google.cloud import storage  # type: ignore
+    import google.auth as google_auth  # type: ignore
     from google.auth.exceptions import DefaultCredentialsError  # type: ignore
+    from google.auth.transport.requests import AuthorizedSession  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+    from google.api_core.exceptions import GoogleAPICallError  # type: ignore
 except Exception:  # pragma: no cover - import errors handled at runtime
     storage = None  # type: ignore
     DefaultCredentialsError = Exception  # type: ignore
+    GoogleAPICallError = Exception  # type: ignore
+
+from config import http_pool_size
 
 LOG = logging.getLogger(__name__)
 
+XML_API = "https://storage.googleapis.com"
+MiB = 1024 * 1024
+
+
+@dataclass
+class MultipartConfig:
+    """
+    Settings for parallel XML-API multipart uploads.
+
+    part_size: bytes per part (GCS requires >= 5 MiB for all but the last part)
+    max_concurrent_parts: parts uploaded in parallel
+    threshold: payloads of at least this many bytes use multipart; smaller ones use a single request
+    """
+    part_size: int = 16 * MiB
+    max_concurrent_parts: int = 4
+    threshold: int = 32 * MiB
+
+
+def _fadvise(fileobj: Any, advice_name: str) -> None:
+    """
+    Best-effort posix_fadvise over the whole file backing fileobj; a no-op for in-memory objects
+    and on platforms without posix_fadvise (e.g. Windows, macOS).
+    """
+    try:
+        os.posix_fadvise(fileobj.fileno(), 0, 0, getattr(os, advice_name))
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        pass
+
+
+@contextlib.contextmanager
+def _readonly_view(fileobj: Any) -> Iterator[Optional[memoryview]]:
+    """
+    Yield a zero-copy memoryview over a BytesIO buffer or a real file (via mmap), or None if neither applies.
+    """
+    if isinstance(fileobj, io.BytesIO):
+        with fileobj.getbuffer() as view:
+            yield view
+        return
+    try:
+        fd = fileobj.fileno()
+    except (AttributeError, OSError, ValueError):
+        yield None
+        return
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        try:
+            # parts are read front to back: favour readahead, then let pages go early
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        with memoryview(mm) as view:
+            yield view
+
+
+class _BufferWriter:
+    """
+    Minimal write-only file object that fills a preallocated buffer in place.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def write(self, data: Any) -> int:
+        n = len(data)
+        end = self._pos + n
+        if end > len(self._view):
+            raise ValueError("object is larger than the destination buffer")
+        self._view[self._pos:end] = data
+        self._pos = end
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
 
 class GCSClient:
     """
@@ -42,40 +151,75 @@ class GCSClient:
     Methods:
     - upload_bytes(data: bytes, key: str, bucket: Optional[str] = None, content_type: Optional[str] = None) -> Dict[str, Any]
     - upload_fileobj(fileobj: io.BytesIO, key: str, bucket: Optional[str] = None, content_type: Optional[str] = None) -> None
+    - download_to_buffer(key: str, bucket: Optional[str] = None, out: Optional[bytearray] = None) -> memoryview
+    - download_parallel(key: str, bucket: Optional[str] = None, concurrency: int = 8, chunk: int = 16 * MiB, out: Optional[bytearray] = None) -> memoryview
     - download_to_bytesio(key: str, bucket: Optional[str] = None) -> io.BytesIO
-    - list_blobs(prefix: Optional[str] = None, bucket: Optional[str] = None) -> List[Dict[str, Any]]
+    - iter_blobs(prefix: Optional[str] = None, bucket: Optional[str] = None, page_size: int = 1000, prefetch: bool = False) -> Iterator[Dict[str, Any]]
+    - list_blobs(prefix: Optional[str] = None, bucket: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict[str, Any]]
     - delete_blob(key: str, bucket: Optional[str] = None) -> bool
+    - delete_blobs(keys: List[str], bucket: Optional[str] = None, concurrency: int = 16) -> List[bool]
     - generate_signed_url(key: str, bucket: Optional[str] = None, expires_in: int = 3600, method: str = "GET") -> str
+    - aupload_bytes / adownload_to_buffer / alist_blobs / adelete_blobs: awaitable versions of the above
     """
 
-    def __init__(self, bucket: Optional[str] = None, client: Optional[Any] = None):
+    def __init__(self, bucket: Optional[str] = None, client: Optional[Any] = None, multipart: Optional[MultipartConfig] = None):
         """
         Args:
             bucket: default bucket name to operate on (optional).
             client: optional google.cloud.storage.Client instance (for testing or custom credentials).
+            multipart: optional MultipartConfig controlling parallel uploads of large payloads.
         """
         if storage is None:
             raise RuntimeError("google-cloud-storage is not available. Install google-cloud-storage package.")
         try:
-            self.client = client or storage.Client()
+            self.client = client or self._build_client()
         except DefaultCredentialsError as exc:
             LOG.exception("Failed to initialize GCS client - credentials not found")
             raise
         self.bucket_name = bucket
+        self.multipart = multipart or MultipartConfig()
+        self._bucket_cache: Dict[str, Any] = {}
+        self._url_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+        self._url_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _build_client():
+        """
+        Build a storage.Client whose HTTP session keeps up to http_pool_size() connections per host
+        (urllib3 defaults to 10, which concurrent tools and multipart uploads quickly exceed).
+        """
+        pool_size = http_pool_size()
+        credentials, project = google_auth.default(scopes=storage.Client.SCOPE)
+        session = AuthorizedSession(credentials)
+        session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        return storage.Client(project=project, credentials=credentials, _http=session)
 
     def _bucket(self, bucket: Optional[str] = None):
         bname = bucket or self.bucket_name
         if not bname:
             raise ValueError("No GCS bucket specified")
-        return self.client.bucket(bname)
+        cached = self._bucket_cache.get(bname)
+        if cached is None:
+            cached = self._bucket_cache.setdefault(bname, self.client.bucket(bname))
+        return cached
+
+    def clear_bucket_cache(self) -> None:
+        """
+        Drop memoized Bucket proxies (e.g. after swapping self.client in tests).
+        """
+        self._bucket_cache.clear()
 
     def upload_bytes(self, data: bytes, key: str, bucket: Optional[str] = None, content_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload raw bytes to GCS as an object. Returns minimal metadata dict on success.
         """
         b = self._bucket(bucket)
-        blob = b.blob(key)
         try:
+            if len(data) >= self.multipart.threshold:
+                with memoryview(data) as view:
+                    self._upload_multipart(b.name, key, view, content_type)
+                return {"bucket": b.name, "name": key, "size": len(data)}
+            blob = b.blob(key)
             blob.upload_from_string(data, content_type=content_type)
             return {"bucket": b.name, "name": blob.name, "size": blob.size}
         except Exception:
@@ -90,45 +234,178 @@ class GCSClient:
         blob = b.blob(key)
         try:
             fileobj.seek(0)
+            size = fileobj.seek(0, io.SEEK_END)
+            fileobj.seek(0)
         except Exception:
-            pass
+            size = None
+        # a real file is read once, sequentially: hint readahead, and drop its pages from the cache afterwards
+        # so a large upload doesn't evict data other tools are using
+        _fadvise(fileobj, "POSIX_FADV_SEQUENTIAL")
         try:
+            if size is not None and size >= self.multipart.threshold:
+                with _readonly_view(fileobj) as view:
+                    if view is not None:
+                        self._upload_multipart(b.name, key, view, content_type)
+                        return
             blob.upload_from_file(fileobj, content_type=content_type)
         except Exception:
             LOG.exception("GCS upload_fileobj failed")
             raise
+        finally:
+            _fadvise(fileobj, "POSIX_FADV_DONTNEED")
 
-    def download_to_bytesio(self, key: str, bucket: Optional[str] = None) -> io.BytesIO:
+    def _upload_multipart(self, bucket_name: str, key: str, data: memoryview, content_type: Optional[str] = None) -> None:
         """
-        Download an object from GCS and return a BytesIO with its contents.
+        Upload data with the XML multipart API: initiate, PUT parts in parallel, complete.
+        Parts are memoryview slices, so no payload bytes are copied. Aborts the upload on failure.
+        """
+        http = self.client._http
+        url = f"{XML_API}/{bucket_name}/{quote(key, safe='/')}"
+        headers = {"Content-Type": content_type} if content_type else {}
+        resp = http.post(f"{url}?uploads", headers=headers)
+        resp.raise_for_status()
+        upload_id = ElementTree.fromstring(resp.content).findtext(".//{*}UploadId")
+        part_size = self.multipart.part_size
+        parts: List[Tuple[int, int, int]] = [
+            (number, start, min(start + part_size, len(data)))
+            for number, start in enumerate(range(0, len(data), part_size), start=1)
+        ]
+
+        def put_part(part: Tuple[int, int, int]) -> str:
+            number, start, end = part
+            with data[start:end] as chunk:
+                r = http.put(url, params={"partNumber": number, "uploadId": upload_id}, data=chunk)
+            r.raise_for_status()
+            return r.headers["ETag"]
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.multipart.max_concurrent_parts) as pool:
+                etags = list(pool.map(put_part, parts))
+            body = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+                for (number, _, _), etag in zip(parts, etags)
+            )
+            resp = http.post(url, params={"uploadId": upload_id}, data=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode("utf-8"))
+            resp.raise_for_status()
+        except Exception:
+            try:
+                http.delete(url, params={"uploadId": upload_id})
+            except Exception:
+                LOG.warning("Failed to abort multipart upload %s for gs://%s/%s", upload_id, bucket_name, key)
+            raise
+
+    def download_to_buffer(self, key: str, bucket: Optional[str] = None, out: Optional[bytearray] = None) -> memoryview:
+        """
+        Download an object into a buffer sized up front from the object metadata and return a memoryview of its bytes.
+
+        Pass a bytearray as `out` to reuse it across calls (e.g. when polling the same object); it is used
+        when large enough, otherwise a new buffer is allocated. The returned view aliases that buffer.
+        Objects stored with a Content-Encoding (e.g. gzip) are decompressed on download, so their size
+        is not known up front; those are read into a growable buffer instead and `out` is not used.
         """
         b = self._bucket(bucket)
         blob = b.blob(key)
-        bio = io.BytesIO()
         try:
-            blob.download_to_file(bio)
-            bio.seek(0)
-            return bio
+            blob.reload()
+            return self._download_blob(blob, out)
         except Exception:
-            LOG.exception("GCS download_to_bytesio failed")
+            LOG.exception("GCS download_to_buffer failed")
             raise
 
-    def list_blobs(self, prefix: Optional[str] = None, bucket: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _download_blob(blob: Any, out: Optional[bytearray]) -> memoryview:
+        # pin the generation so the bytes match the metadata we sized from
+        if blob.content_encoding:
+            bio = io.BytesIO()
+            blob.download_to_file(bio, if_generation_match=blob.generation)
+            return bio.getbuffer()
+        size = blob.size or 0
+        buf = out if out is not None and len(out) >= size else bytearray(size)
+        view = memoryview(buf)[:size]
+        blob.download_to_file(_BufferWriter(view), if_generation_match=blob.generation)
+        return view
+
+    def download_parallel(self, key: str, bucket: Optional[str] = None, concurrency: int = 8, chunk: int = 16 * MiB,
+                          out: Optional[bytearray] = None) -> memoryview:
         """
-        List blobs in the target bucket under the given prefix.
-        Returns a list of metadata dicts.
+        Download a large object as concurrent ranged GETs into a single preallocated buffer and return a memoryview.
+
+        Every range is read from the generation seen by the initial metadata fetch, so a concurrent overwrite
+        cannot produce a mixed result. Objects no larger than one chunk, and objects stored with a
+        Content-Encoding (whose ranges refer to the stored bytes, not the decoded ones), are downloaded
+        with a single request.
+        """
+        b = self._bucket(bucket)
+        if concurrency > http_pool_size():
+            LOG.warning("download_parallel concurrency %d exceeds HTTP pool size %d", concurrency, http_pool_size())
+        try:
+            blob = b.blob(key)
+            blob.reload()
+            size = blob.size or 0
+            if size <= chunk or blob.content_encoding:
+                return self._download_blob(blob, out)
+            buf = out if out is not None and len(out) >= size else bytearray(size)
+            view = memoryview(buf)[:size]
+            generation = blob.generation
+
+            def fetch(start: int) -> None:
+                end = min(start + chunk, size)
+                part = b.blob(key, generation=generation)
+                # the stored object hash covers the whole object, not a range, so skip per-range validation
+                part.download_to_file(_BufferWriter(view[start:end]), start=start, end=end - 1, checksum=None)
+
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(fetch, range(0, size, chunk)))
+            return view
+        except Exception:
+            LOG.exception("GCS download_parallel failed")
+            raise
+
+    def download_to_bytesio(self, key: str, bucket: Optional[str] = None) -> io.BytesIO:
+        """
+        Download an object from GCS and return a BytesIO with its contents.
+        Prefer download_to_buffer, which avoids the copy into the BytesIO.
+        """
+        return io.BytesIO(self.download_to_buffer(key, bucket=bucket))
+
+    def iter_blobs(self, prefix: Optional[str] = None, bucket: Optional[str] = None, page_size: int = 1000,
+                   prefetch: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield metadata dicts for blobs under the given prefix, one listing page at a time.
+        With prefetch=True the next page is requested on a background thread while the current one is consumed.
         """
         b = self._bucket(bucket)
         try:
-            iterator = b.list_blobs(prefix=prefix, max_results=max_results)
-            results = []
-            for blob in iterator:
-                results.append({"name": blob.name, "size": blob.size, "updated": blob.updated})
-            return results
+            pages = iter(b.list_blobs(prefix=prefix, page_size=page_size).pages)
+            if not prefetch:
+                for page in pages:
+                    for blob in page:
+                        yield {"name": blob.name, "size": blob.size, "updated": blob.updated}
+                return
+            pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                pending = pool.submit(next, pages, None)
+                while True:
+                    page = pending.result()
+                    if page is None:
+                        return
+                    pending = pool.submit(next, pages, None)
+                    for blob in page:
+                        yield {"name": blob.name, "size": blob.size, "updated": blob.updated}
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
         except Exception:
             LOG.exception("GCS list_blobs failed")
             raise
 
+    def list_blobs(self, prefix: Optional[str] = None, bucket: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List blobs in the target bucket under the given prefix.
+        Returns a list of metadata dicts; use iter_blobs to stream large listings.
+        """
+        page_size = min(max_results, 1000) if max_results else 1000
+        return list(islice(self.iter_blobs(prefix=prefix, bucket=bucket, page_size=page_size), max_results))
+
     def delete_blob(self, key: str, bucket: Optional[str] = None) -> bool:
         """
         Delete an object from GCS. Returns True on success.
@@ -142,16 +419,60 @@ class GCSClient:
             LOG.exception("GCS delete_blob failed")
             raise
 
+    def delete_blobs(self, keys: List[str], bucket: Optional[str] = None, concurrency: int = 16) -> List[bool]:
+        """
+        Delete many objects with up to `concurrency` requests in flight (capped at the HTTP pool size).
+        Returns one success flag per key, in order; a key the API refuses (e.g. missing) reports False
+        rather than raising. Transport errors still raise.
+        """
+        b = self._bucket(bucket)
+
+        def delete(key: str) -> bool:
+            try:
+                b.blob(key).delete()
+                return True
+            except GoogleAPICallError as exc:
+                LOG.debug("GCS delete of %s failed: %s", key, exc)
+                return False
+
+        workers = max(1, min(concurrency, http_pool_size(), len(keys) or 1))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(delete, keys))
+        except Exception:
+            LOG.exception("GCS delete_blobs failed")
+            raise
+
     def generate_signed_url(self, key: str, bucket: Optional[str] = None, expires_in: int = 3600, method: str = "GET") -> str:
         """
         Generate a signed URL for GET/PUT operations on an object.
         Requires credentials capable of signing (service account).
         """
         b = self._bucket(bucket)
+        step = max(1, min(60, expires_in // 10))
+        cache_key = (b.name, key, method, expires_in, int(time.time() // step))
+        with self._url_cache_lock:
+            url = self._url_cache.get(cache_key)
+        if url is not None:
+            return url
         blob = b.blob(key)
         try:
             url = blob.generate_signed_url(expiration=expires_in, method=method)
-            return url
         except Exception:
             LOG.exception("GCS generate_signed_url failed")
             raise
+        with self._url_cache_lock:
+            self._url_cache[cache_key] = url
+        return url
+
+    async def aupload_bytes(self, data: bytes, key: str, bucket: Optional[str] = None, content_type: Optional[str] = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.upload_bytes, data, key, bucket, content_type)
+
+    async def adownload_to_buffer(self, key: str, bucket: Optional[str] = None, out: Optional[bytearray] = None) -> memoryview:
+        return await asyncio.to_thread(self.download_to_buffer, key, bucket, out)
+
+    async def alist_blobs(self, prefix: Optional[str] = None, bucket: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.list_blobs, prefix, bucket, max_results)
+
+    async def adelete_blobs(self, keys: List[str], bucket: Optional[str] = None, concurrency: int = 16) -> List[bool]:
+        return await asyncio.to_thread(self.delete_blobs, keys, bucket, concurrency)
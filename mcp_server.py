@@ -14,6 +14,10 @@ Tools provided:
 - s3_generate_presigned_get(bucket, key, expires_in) -> str
 - s3_list_objects(prefix=None, bucket=None) -> list
 - s3_delete_object(key, bucket=None) -> dict
+- s3_delete_objects(keys, bucket=None) -> dict
+- s3_head_objects(keys, bucket=None) -> dict
+- gcs_list_blobs(prefix=None, bucket=None, max_keys=1000) -> list
+- gcs_delete_blobs(keys, bucket=None) -> dict
 - dynamo_put_item(table, item) -> dict
 - dynamo_get_item(table, key) -> dict | None
 - dynamo_delete_item(table, key) -> dict
@@ -22,55 +26,119 @@ Tools provided:
 
 from __future__ import annotations
 import argparse
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
 import logging
-import shlex
-from typing import Optional, Dict, Any, List
-
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+from cachetools import TTLCache
 from fastmcp import FastMCP
 
-from config import aws_credentials_dict
-from aws.s3_client import S3Client
-from aws.dynamo_client import DynamoClient
-from boto3.dynamodb.conditions import Key  # type: ignore
+from config import aws_credentials_dict, http_pool_size, tool_workers, warm_clients_enabled
+from tools import basic
 from tools.runner import run_cmd, CommandResult
 
+# The cloud SDKs (boto3/botocore, google-cloud-*) take most of the import time, so they are imported
+# by the client accessors on first use rather than here; unless client warm-up is enabled
+# (--warm-clients / DATAMCP_WARM_CLIENTS), a session that never touches S3 or GCS doesn't pay for them.
+if TYPE_CHECKING:
+    from aws.s3_client import S3Client
+    from aws.dynamo_client import DynamoClient
+    from gcp.storage_client import GCSClient
+    from boto3.dynamodb.conditions import Key  # type: ignore
+
 LOG = logging.getLogger(__name__)
 
 mcp = FastMCP("DataMCP — FastMCP Server (AWS Integrations)")
 
-# initialize clients lazily (use defaults from config if available)
+# shared clients: one instance of each serves every tool call and thread (boto3 clients and
+# google-cloud clients are thread-safe); the bucket/table is passed per call, not baked in
+_client_lock = threading.Lock()
 _s3_client: Optional[S3Client] = None
 _dynamo_client: Optional[DynamoClient] = None
+_gcs_client: Optional[GCSClient] = None
+
+# shared pool for tools that fan out over many keys; sized within the HTTP connection pool
+_EXECUTOR = ThreadPoolExecutor(max_workers=tool_workers(), thread_name_prefix="datamcp-tool")
+atexit.register(_EXECUTOR.shutdown)
+
+# presigned URLs are deterministic for a given signing time, so identical requests within a short
+# window reuse one signature; the window is at most a tenth of expires_in so reused URLs stay fresh
+_URL_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_URL_CACHE_LOCK = threading.Lock()
+
+
+def _presigned_url(key: str, bucket: Optional[str], expires_in: int, http_method: str) -> str:
+    step = max(1, min(60, expires_in // 10))
+    cache_key = (bucket, key, http_method, expires_in, int(time.time() // step))
+    with _URL_CACHE_LOCK:
+        url = _URL_CACHE.get(cache_key)
+    if url is None:
+        url = get_s3(bucket=bucket).generate_presigned_url(key=key, bucket=bucket, expires_in=expires_in, http_method=http_method)
+        with _URL_CACHE_LOCK:
+            _URL_CACHE[cache_key] = url
+    return url
 
 
 def get_s3(bucket: Optional[str] = None) -> S3Client:
     global _s3_client
     if _s3_client is None:
-        # credentials handled inside S3Client via config.aws_credentials_dict()
-        _s3_client = S3Client(bucket=bucket)
+        with _client_lock:
+            if _s3_client is None:
+                from botocore.config import Config
+                from aws.s3_client import S3Client
+                # credentials handled inside S3Client via config.aws_credentials_dict()
+                _s3_client = S3Client(config=Config(max_pool_connections=http_pool_size()))
     return _s3_client
 
 
 def get_dynamo(table: Optional[str] = None) -> DynamoClient:
     global _dynamo_client
     if _dynamo_client is None:
-        _dynamo_client = DynamoClient(table_name=table)
+        with _client_lock:
+            if _dynamo_client is None:
+                from botocore.config import Config
+                from aws.dynamo_client import DynamoClient
+                _dynamo_client = DynamoClient(config=Config(max_pool_connections=http_pool_size()))
     return _dynamo_client
 
 
-#
-# Basic example tools
-#
-@mcp.tool
-def say_hello(name: str) -> str:
-    """Return a simple greeting."""
-    return f"Hello, {name}!"
+def get_gcs(bucket: Optional[str] = None) -> GCSClient:
+    global _gcs_client
+    if _gcs_client is None:
+        with _client_lock:
+            if _gcs_client is None:
+                from gcp.storage_client import GCSClient
+                _gcs_client = GCSClient()
+    return _gcs_client
 
 
-@mcp.tool
-def add_numbers(a: float, b: float) -> float:
-    """Return the sum of two numbers."""
-    return a + b
+def warm_clients() -> None:
+    """
+    Build the shared clients so the first tool calls don't pay for SDK imports and construction.
+    Clients that can't be built here (e.g. no GCP credentials) are left to fail on first use.
+    With --warm-clients (or DATAMCP_WARM_CLIENTS=1), run() calls this on a background thread so the
+    server starts accepting requests immediately.
+    """
+    for getter in (get_s3, get_dynamo, get_gcs):
+        try:
+            getter()
+        except Exception as exc:
+            LOG.warning("Skipping warm-up of %s: %s", getter.__name__, exc)
+
+
+#
+# Basic example tools (say_hello, add_numbers)
+#
+basic.register(mcp)
 
 
 #
@@ -82,8 +150,7 @@ def s3_generate_presigned_put(key: str, bucket: Optional[str] = None, expires_in
     Generate a presigned PUT URL so a client can upload directly to S3.
     Returns the presigned URL string.
     """
-    s3 = get_s3(bucket=bucket)
-    return s3.generate_presigned_url(key=key, bucket=bucket, expires_in=expires_in, http_method="PUT")
+    return _presigned_url(key, bucket, expires_in, "PUT")
 
 
 @mcp.tool
@@ -91,8 +158,7 @@ def s3_generate_presigned_get(key: str, bucket: Optional[str] = None, expires_in
     """
     Generate a presigned GET URL for downloading an object.
     """
-    s3 = get_s3(bucket=bucket)
-    return s3.generate_presigned_url(key=key, bucket=bucket, expires_in=expires_in, http_method="GET")
+    return _presigned_url(key, bucket, expires_in, "GET")
 
 
 @mcp.tool
@@ -114,6 +180,52 @@ def s3_delete_object(key: str, bucket: Optional[str] = None) -> Dict[str, Any]:
     return s3.delete_object(key=key, bucket=bucket)
 
 
+@mcp.tool
+def s3_delete_objects(keys: List[str], bucket: Optional[str] = None) -> Dict[str, bool]:
+    """
+    Delete many objects from S3 using DeleteObjects (1000 keys per request, requests run in parallel).
+    Returns a per-key success map.
+    """
+    s3 = get_s3(bucket=bucket)
+    chunks = [keys[i:i + 1000] for i in range(0, len(keys), 1000)]
+    failed = set()
+    for resp in _EXECUTOR.map(lambda chunk: s3.delete_objects(chunk, bucket=bucket), chunks):
+        failed.update(err["Key"] for err in resp.get("Errors", []))
+    return {k: k not in failed for k in keys}
+
+
+@mcp.tool
+def s3_head_objects(keys: List[str], bucket: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetch metadata for many objects in parallel. Missing keys map to None.
+    """
+    s3 = get_s3(bucket=bucket)
+    return dict(zip(keys, _EXECUTOR.map(lambda k: s3.head_object(k, bucket=bucket), keys)))
+
+
+#
+# GCS tools
+#
+@mcp.tool
+async def gcs_list_blobs(prefix: Optional[str] = None, bucket: Optional[str] = None, max_keys: int = 1000) -> List[Dict[str, Any]]:
+    """
+    List GCS objects under the given prefix, stopping as soon as max_keys results are collected.
+    Returns list of {name, size, updated} dicts.
+    """
+    gcs = get_gcs(bucket=bucket)
+    return await gcs.alist_blobs(prefix=prefix, bucket=bucket, max_results=max_keys)
+
+
+@mcp.tool
+async def gcs_delete_blobs(keys: List[str], bucket: Optional[str] = None) -> Dict[str, bool]:
+    """
+    Delete many GCS objects with concurrent requests over the shared connection pool.
+    Not transactional: returns a per-key success map, False for keys that could not be deleted.
+    """
+    gcs = get_gcs(bucket=bucket)
+    return dict(zip(keys, await gcs.adelete_blobs(keys, bucket=bucket)))
+
+
 #
 # DynamoDB tools
 #
@@ -144,6 +256,13 @@ def dynamo_delete_item(key: Dict[str, Any], table: Optional[str] = None) -> Dict
     return dyn.delete_item(key=key, table_name=table)
 
 
+@functools.lru_cache(maxsize=256)
+def _partition_key(key_name: str) -> Key:
+    # Key objects are immutable; .eq() builds a new condition, so one Key per attribute name can be shared
+    from boto3.dynamodb.conditions import Key  # type: ignore
+    return Key(key_name)
+
+
 @mcp.tool
 def dynamo_query(table: str, key_name: str, key_value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
@@ -151,42 +270,110 @@ def dynamo_query(table: str, key_name: str, key_value: Any, limit: Optional[int]
     Returns list of matching items.
     """
     dyn = get_dynamo(table=table)
-    key_expr = Key(key_name).eq(key_value)
+    key_expr = _partition_key(key_name).eq(key_value)
     return dyn.query(key_condition=key_expr, table_name=table, limit=limit)
 
 
+def _in_thread(fn):
+    """
+    Turn a blocking tool body into a coroutine that runs it on a worker thread, so long CLI runs
+    (terraform, helm, argocd, gcloud) don't stall the event loop serving other tool calls.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return wrapper
+
+
+# tf_dir -> init fingerprint as of the last successful `terraform init`
+_INIT_CACHE: Dict[str, str] = {}
+
+
+def _init_fingerprint(tf_dir: str) -> Optional[str]:
+    """
+    Hash of everything `terraform init` acts on: the provider lockfile, the root module's configuration
+    (*.tf / *.tf.json, where module sources and backend blocks live) and the installed module manifest.
+    None when there is no lockfile yet, i.e. init has never completed here.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(os.path.join(tf_dir, ".terraform.lock.hcl"), "rb") as fh:
+            h.update(fh.read())
+        names = sorted(n for n in os.listdir(tf_dir) if n.endswith((".tf", ".tf.json")))
+    except OSError:
+        return None
+    for name in names + [os.path.join(".terraform", "modules", "modules.json")]:
+        try:
+            with open(os.path.join(tf_dir, name), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            continue
+        h.update(name.encode("utf-8") + b"\0" + len(data).to_bytes(8, "big") + data)
+    return h.hexdigest()
+
+
+def _terraform_init(tf_dir: str, dry_run: bool, force: bool = False) -> CommandResult:
+    """
+    Run `terraform init` unless it already succeeded for this directory and neither the provider
+    lockfile, the root *.tf files (module sources, backend config), the module manifest nor the
+    .terraform directory has changed since.
+    """
+    init_cmd = ["terraform", "init", "-input=false"]
+    fp = _init_fingerprint(tf_dir)
+    if (not force and not dry_run and fp is not None and _INIT_CACHE.get(tf_dir) == fp
+            and os.path.isdir(os.path.join(tf_dir, ".terraform"))):
+        return CommandResult(returncode=0, stdout="[cached] terraform init", stderr="", cmd=" ".join(init_cmd), cwd=tf_dir)
+    result = run_cmd(init_cmd, cwd=tf_dir, dry_run=dry_run)
+    if not dry_run and result.returncode == 0:
+        # init may have created or updated the lockfile and module manifest, so fingerprint afterwards
+        fp = _init_fingerprint(tf_dir)
+        if fp is not None:
+            _INIT_CACHE[tf_dir] = fp
+    return result
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Run the DataMCP FastMCP server.")
     parser.add_argument("--transport", default=None, help="Transport to use (e.g. http, stdio).")
     parser.add_argument("--port", type=int, default=None, help="Port for HTTP transport.")
+    parser.add_argument("--warm-clients", action="store_true", default=warm_clients_enabled(),
+                        help="Build the S3/DynamoDB/GCS clients in the background at startup (env: DATAMCP_WARM_CLIENTS).")
     return parser.parse_args()
 
 
 @mcp.tool
-def apply_terraform(cloud: str, env: str, workspace: Optional[str] = None, vars: Optional[Dict[str, Any]] = None, dry_run: bool = True, auto_approve: bool = False) -> Dict[str, Any]:
+@_in_thread
+def apply_terraform(cloud: str, env: str, workspace: Optional[str] = None, vars: Optional[Dict[str, Any]] = None, dry_run: bool = True, auto_approve: bool = False, force_init: bool = False) -> Dict[str, Any]:
     """
     MCP tool skeleton to run terraform operations for a given cloud and environment.
     This function runs in dry_run mode by default. It locates infra/{cloud}/envs/{env}
     and runs terraform init/plan (and apply if auto_approve is True).
+    init is skipped while the lockfile and *.tf configuration are unchanged since the last successful init; force_init re-runs it.
     Returns a structured dict with command outputs and status.
     """
     # locate directory
     tf_dir = f"infra/{cloud}/envs/{env}"
-    if vars:
-        # For a real implementation, write vars to a temporary tfvars file and pass via -var-file
-        var_args = " ".join(f"-var '{k}={v}'" for k, v in (vars or {}).items())
-    else:
-        var_args = ""
-
-    init_cmd = ["terraform", "init", "-input=false"]
-    plan_cmd = ["terraform", "plan", "-input=false", "-no-color"] + (shlex.split(var_args) if var_args else [])
-    result_init = run_cmd(init_cmd, cwd=tf_dir, dry_run=dry_run)
-    result_plan = run_cmd(plan_cmd, cwd=tf_dir, dry_run=dry_run)
-
-    apply_result = None
-    if auto_approve:
-        apply_cmd = ["terraform", "apply", "-auto-approve", "-input=false"] + (shlex.split(var_args) if var_args else [])
-        apply_result = run_cmd(apply_cmd, cwd=tf_dir, dry_run=dry_run)
+    var_file = None
+    var_args: List[str] = []
+    try:
+        if vars:
+            # a .tfvars.json keeps argv small however many vars there are, and preserves value types
+            with tempfile.NamedTemporaryFile("w", suffix=".tfvars.json", delete=False) as fh:
+                var_file = fh.name
+                json.dump(vars, fh)
+            var_args = ["-var-file", var_file]
+
+        plan_cmd = ["terraform", "plan", "-input=false", "-no-color"] + var_args
+        result_init = _terraform_init(tf_dir, dry_run=dry_run, force=force_init)
+        result_plan = run_cmd(plan_cmd, cwd=tf_dir, dry_run=dry_run)
+
+        apply_result = None
+        if auto_approve:
+            apply_cmd = ["terraform", "apply", "-auto-approve", "-input=false"] + var_args
+            apply_result = run_cmd(apply_cmd, cwd=tf_dir, dry_run=dry_run)
+    finally:
+        if var_file:
+            os.unlink(var_file)
 
     return {
         "init": {"rc": result_init.returncode, "stdout": result_init.stdout, "stderr": result_init.stderr},
@@ -197,6 +384,7 @@ def apply_terraform(cloud: str, env: str, workspace: Optional[str] = None, vars:
 
 
 @mcp.tool
+@_in_thread
 def destroy_terraform(cloud: str, env: str, dry_run: bool = True, auto_approve: bool = False) -> Dict[str, Any]:
     """
     MCP tool skeleton to destroy terraform-managed infra.
@@ -216,6 +404,7 @@ def destroy_terraform(cloud: str, env: str, dry_run: bool = True, auto_approve:
 
 
 @mcp.tool
+@_in_thread
 def helm_deploy(kube_context: Optional[str], chart_path: str, release_name: str, namespace: str, values: Optional[Dict[str, Any]] = None, dry_run: bool = True) -> Dict[str, Any]:
     """
     MCP tool skeleton to install/upgrade a Helm chart.
@@ -233,6 +422,7 @@ def helm_deploy(kube_context: Optional[str], chart_path: str, release_name: str,
 
 
 @mcp.tool
+@_in_thread
 def argo_sync(app_name: str, argocd_ctx: Optional[str] = None, dry_run: bool = True) -> Dict[str, Any]:
     """
     MCP tool skeleton to sync an ArgoCD application by name using the argocd CLI.
@@ -244,6 +434,7 @@ def argo_sync(app_name: str, argocd_ctx: Optional[str] = None, dry_run: bool = T
 
 
 @mcp.tool
+@_in_thread
 def gcp_create_project(project_id: str, billing_account: str, org_id: Optional[str] = None, dry_run: bool = True) -> Dict[str, Any]:
     """
     MCP tool skeleton to create a GCP project using gcloud CLI. Requires organization permissions.
@@ -269,6 +460,8 @@ def run():
         run_kwargs["transport"] = args.transport
     if args.port:
         run_kwargs["port"] = args.port
+    if args.warm_clients:
+        threading.Thread(target=warm_clients, name="datamcp-warmup", daemon=True).start()
     mcp.run(**run_kwargs)
 
 
@@ -23,6 +23,8 @@ source:
 transform:
   csv:
     delimiter: ","
+  schema:                # optional: arrow type per column; skips type inference
+    id: int64
 destination:
   type: s3               # or "local"
   s3_bucket: my-output-bucket
@@ -35,23 +37,48 @@ options:
 
 from __future__ import annotations
 import argparse
+import functools
+import io
 import logging
 import os
+import shutil
+import stat
 import sys
 import tempfile
 import time
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, BinaryIO, List, NamedTuple, Set, Tuple
 
 import yaml
 
+# libyaml's C loader when available; same safe semantics as yaml.safe_load
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 # Optional imports
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from boto3.exceptions import Boto3Error
     from botocore.exceptions import BotoCoreError, ClientError
+    # transfer failures: botocore errors plus boto3's wrappers (S3UploadFailedError, RetriesExceededError)
+    _S3_ERRORS = (BotoCoreError, ClientError, Boto3Error)
+    # multipart, multi-threaded transfers for anything over 8 MiB
+    _TC = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=16,
+        use_threads=True,
+    )
 except Exception:
     boto3 = None
+    _TC = None
     BotoCoreError = ClientError = Exception  # type: ignore
+    _S3_ERRORS = (Exception,)
 
 try:
     import pandas as pd
@@ -70,26 +97,88 @@ except Exception:
     except Exception:
         _parquet_available = False
 
+# Streaming CSV -> Parquet via Arrow (preferred: memory stays bounded by one CSV block)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pa_csv = pq = None
+
+CSV_BLOCK_SIZE = 8 << 20  # bytes of CSV parsed per record batch
+SPOOL_MAX_BYTES = 64 << 20  # Parquet output kept in memory up to this size before spilling to tmp_dir
+CSV_WRITE_CHUNK_ROWS = 50_000  # rows per chunk when pandas writes gzipped CSV
+
+# pyarrow Parquet writer settings: zstd level 3 is ~30% smaller than snappy at similar encode cost
+PARQUET_OPTIONS: Dict[str, Any] = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "data_page_version": "2.0",
+    "write_statistics": True,
+}
+
+# Polars streaming engine (preferred over Arrow when installed: lazy scan, multi-threaded parse)
+try:
+    import polars as pl
+except Exception:
+    pl = None
+
+# Polars sink settings derived from PARQUET_OPTIONS so the codec, level and statistics match whichever
+# engine runs. Polars has no use_dictionary/data_page_version switches (it dictionary-encodes on its own),
+# so page layout and row-group boundaries can still differ from the Arrow writer's.
+POLARS_PARQUET_OPTIONS: Dict[str, Any] = {
+    "compression": PARQUET_OPTIONS["compression"],
+    "compression_level": PARQUET_OPTIONS["compression_level"],
+    "statistics": PARQUET_OPTIONS["write_statistics"],
+    "row_group_size": 128_000,
+}
+
+# Fallback (no Parquet) output compression: ISA-L gzip is a byte-compatible drop-in when installed;
+# zstandard is opt-in via transform.compression: zstd
+try:
+    from isal import igzip as _gzip
+    GZIP_LEVEL = 2  # ISA-L only accepts levels 0-3; 2 is its default
+except Exception:
+    import gzip as _gzip
+    GZIP_LEVEL = 6  # zlib default; level 9 is several times slower for a few percent smaller output
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+ZSTD_LEVEL = 3
+
 logger = logging.getLogger("batch_ingest")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
-def retry(fn, max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
-    """Simple retry wrapper with exponential backoff."""
-    def wrapper(*args, **kwargs):
-        tries = 0
-        while True:
-            try:
-                return fn(*args, **kwargs)
-            except Exception as e:
-                tries += 1
-                if tries > max_retries:
-                    logger.exception("Exceeded retries for %s", fn.__name__)
-                    raise
-                sleep = delay * (backoff ** (tries - 1))
-                logger.warning("Retry %d/%d after error: %s (sleep %.1fs)", tries, max_retries, e, sleep)
-                time.sleep(sleep)
-    return wrapper
+class S3Location(NamedTuple):
+    bucket: str
+    key: str
+
+
+_BACKOFF = (1.0, 2.0, 4.0, 8.0)  # seconds before retry n; later retries reuse the last value
+_NOT_FOUND_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_s3_path(s3_path: str) -> S3Location:
+    # Accept either "bucket/key" or "s3://bucket/key"
+    if s3_path.startswith("s3://"):
+        s3_path = s3_path[5:]
+    bucket, _, key = s3_path.partition("/")
+    return S3Location(bucket, key)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_shared_s3_client():
+    """One S3 client (credential chain, config, connection pool) shared by every adapter and runner."""
+    return boto3.client("s3", config=BotoConfig(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+    ))
 
 
 class StorageAdapter:
@@ -105,6 +194,67 @@ class StorageAdapter:
     def list(self, prefix: str):
         raise NotImplementedError
 
+    def stream_source(self, path: str) -> BinaryIO:
+        """Open the object for sequential binary reading; the caller closes it."""
+        raise NotImplementedError
+
+    def upload_fileobj(self, fileobj: BinaryIO, remote_path: str):
+        """Upload the contents of a readable binary file object."""
+        raise NotImplementedError
+
+    def publish(self, local_path: str, remote_path: str):
+        """Upload a temp file the caller no longer needs; adapters may move it rather than copy it."""
+        self.upload(local_path, remote_path)
+
+    def prewarm(self, prefix: str) -> None:
+        """Optionally cache which objects exist under prefix so exists() avoids per-object lookups."""
+        return None
+
+
+class _TeeReader(io.RawIOBase):
+    """
+    Non-seekable reader over `raw` that keeps an in-memory copy of the bytes it returns, up to `limit`
+    bytes; past that the copy is dropped (`overflowed`) so memory stays bounded. `failed` is set once a
+    read from `raw` raises, after which the rest of the stream can't be trusted.
+    """
+
+    def __init__(self, raw: BinaryIO, limit: int):
+        super().__init__()
+        self._raw = raw
+        self._limit = limit
+        self._copy: Optional[io.BytesIO] = io.BytesIO()
+        self.failed = False
+
+    @property
+    def overflowed(self) -> bool:
+        return self._copy is None
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            data = self._raw.read() if size is None or size < 0 else self._raw.read(size)
+        except Exception:
+            self.failed = True
+            raise
+        if self._copy is not None:
+            if self._copy.tell() + len(data) > self._limit:
+                self._copy = None
+            else:
+                self._copy.write(data)
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def stage(self, sink: BinaryIO) -> None:
+        """Write the bytes read so far followed by the rest of `raw` to sink (only valid if not overflowed or failed)."""
+        sink.write(self._copy.getbuffer())
+        shutil.copyfileobj(self._raw, sink, 1 << 20)
+
 
 class LocalStorageAdapter(StorageAdapter):
     def exists(self, path: str) -> bool:
@@ -115,74 +265,152 @@ class LocalStorageAdapter(StorageAdapter):
         if not os.path.exists(remote_path):
             raise FileNotFoundError(f"Local source not found: {remote_path}")
         logger.info("Copying local file %s -> %s", remote_path, local_path)
-        with open(remote_path, "rb") as rf, open(local_path, "wb") as wf:
-            wf.write(rf.read())
+        # copyfile uses copy_file_range/sendfile where available, so data never passes through Python
+        shutil.copyfile(remote_path, local_path)
+
+    def stream_source(self, path: str) -> BinaryIO:
+        return open(path, "rb")
 
     def upload(self, local_path: str, remote_path: str):
         os.makedirs(os.path.dirname(remote_path) or ".", exist_ok=True)
         logger.info("Writing local file %s -> %s", local_path, remote_path)
-        with open(local_path, "rb") as rf, open(remote_path, "wb") as wf:
-            wf.write(rf.read())
+        shutil.copyfile(local_path, remote_path)
+
+    def publish(self, local_path: str, remote_path: str):
+        # a rename when tmp_dir and the destination share a filesystem, so the output is never copied
+        os.makedirs(os.path.dirname(remote_path) or ".", exist_ok=True)
+        # mkstemp files are 0600; give the output the mode a copy would have had: the existing file's,
+        # or 0666 less the current umask, which the kernel applies when creating the file here
+        fd = os.open(remote_path, os.O_WRONLY | os.O_CREAT, 0o666)
+        try:
+            mode = stat.S_IMODE(os.fstat(fd).st_mode)
+        finally:
+            os.close(fd)
+        logger.info("Moving local file %s -> %s", local_path, remote_path)
+        shutil.move(local_path, remote_path)
+        os.chmod(remote_path, mode)
 
     def list(self, prefix: str):
-        results = []
         if os.path.isdir(prefix):
-            for root, _, files in os.walk(prefix):
-                for f in files:
-                    results.append(os.path.join(root, f))
-        elif os.path.isfile(prefix):
-            results.append(prefix)
-        return results
+            return list(self._iter_files(prefix))
+        if os.path.isfile(prefix):
+            return [prefix]
+        return []
+
+    def _iter_files(self, directory: str):
+        # scandir's DirEntry caches the file type from readdir, so no extra stat per entry
+        with os.scandir(directory) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.path
+                elif entry.is_dir(follow_symlinks=False):  # like os.walk: don't descend into linked dirs
+                    subdirs.append(entry.path)
+        for subdir in subdirs:
+            yield from self._iter_files(subdir)
 
 
 class S3StorageAdapter(StorageAdapter):
-    def __init__(self, s3_client=None):
+    def __init__(self, s3_client=None, max_retries: int = 3):
         if boto3 is None:
             raise RuntimeError("boto3 is required for S3 operations but it's not installed")
-        self.s3 = s3_client or boto3.client("s3")
-
-    def _parse_s3_path(self, s3_path: str):
-        # Accept either "bucket/key" or "s3://bucket/key"
-        if s3_path.startswith("s3://"):
-            s3_path = s3_path[5:]
-        parts = s3_path.split("/", 1)
-        if len(parts) == 1:
-            return parts[0], ""
-        return parts[0], parts[1]
+        self.s3 = s3_client or _get_shared_s3_client()
+        self.max_retries = max_retries
+        # (bucket, key_prefix) -> keys under that prefix, as listed by prewarm()
+        self._existence_cache: Dict[Tuple[str, str], Set[str]] = {}
+
+    def _cached_listing(self, bucket: str, key: str) -> Optional[Set[str]]:
+        for (b, prefix), keys in self._existence_cache.items():
+            if b == bucket and key.startswith(prefix):
+                return keys
+        return None
+
+    def prewarm(self, prefix: str) -> None:
+        """
+        List everything under prefix once; exists() then answers from memory for keys under it
+        instead of issuing one HEAD per object. The listing is a snapshot: objects deleted by
+        another writer afterwards still report as existing.
+        """
+        bucket, key_prefix = _parse_s3_path(prefix)
+        paginator = self.s3.get_paginator("list_objects_v2")
+        keys: Set[str] = set()
+        for page in paginator.paginate(Bucket=bucket, Prefix=key_prefix):
+            keys.update(obj["Key"] for obj in page.get("Contents", []))
+        self._existence_cache[(bucket, key_prefix)] = keys
 
     def exists(self, s3_path: str) -> bool:
-        bucket, key = self._parse_s3_path(s3_path)
+        bucket, key = _parse_s3_path(s3_path)
+        cached = self._cached_listing(bucket, key)
+        if cached is not None:
+            return key in cached
         try:
             self.s3.head_object(Bucket=bucket, Key=key)
             return True
         except ClientError as e:
-            if getattr(e, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            if (e.response or {}).get("Error", {}).get("Code") in _NOT_FOUND_CODES:
                 return False
             raise
 
-    @retry
+    def _transfer(self, fn, *args, **kwargs):
+        """Call a boto3 transfer method, retrying S3 errors up to max_retries times with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except _S3_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                sleep = _BACKOFF[min(attempt, len(_BACKOFF) - 1)]
+                attempt += 1
+                logger.warning("Retry %d/%d after error: %s (sleep %.1fs)", attempt, self.max_retries, e, sleep)
+                time.sleep(sleep)
+
     def download(self, s3_path: str, local_path: str):
-        bucket, key = self._parse_s3_path(s3_path)
+        bucket, key = _parse_s3_path(s3_path)
         os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
         logger.info("Downloading s3://%s/%s -> %s", bucket, key, local_path)
         try:
-            self.s3.download_file(bucket, key, local_path)
-        except (BotoCoreError, ClientError):
+            self._transfer(self.s3.download_file, bucket, key, local_path, Config=_TC)
+        except _S3_ERRORS:
             logger.exception("S3 download failed for s3://%s/%s", bucket, key)
             raise
 
-    @retry
+    def stream_source(self, s3_path: str) -> BinaryIO:
+        bucket, key = _parse_s3_path(s3_path)
+        logger.info("Streaming s3://%s/%s", bucket, key)
+        return self._transfer(self.s3.get_object, Bucket=bucket, Key=key)["Body"]
+
     def upload(self, local_path: str, s3_path: str):
-        bucket, key = self._parse_s3_path(s3_path)
+        bucket, key = _parse_s3_path(s3_path)
         logger.info("Uploading %s -> s3://%s/%s", local_path, bucket, key)
         try:
-            self.s3.upload_file(local_path, bucket, key)
-        except (BotoCoreError, ClientError):
+            self._transfer(self.s3.upload_file, local_path, bucket, key, Config=_TC)
+        except _S3_ERRORS:
             logger.exception("S3 upload failed for s3://%s/%s", bucket, key)
             raise
+        cached = self._cached_listing(bucket, key)
+        if cached is not None:
+            cached.add(key)
+
+    def upload_fileobj(self, fileobj: BinaryIO, s3_path: str):
+        bucket, key = _parse_s3_path(s3_path)
+        logger.info("Uploading buffer -> s3://%s/%s", bucket, key)
+
+        def put():
+            fileobj.seek(0)  # rewind for each attempt
+            self.s3.upload_fileobj(fileobj, bucket, key, Config=_TC)
+
+        try:
+            self._transfer(put)
+        except _S3_ERRORS:
+            logger.exception("S3 upload failed for s3://%s/%s", bucket, key)
+            raise
+        cached = self._cached_listing(bucket, key)
+        if cached is not None:
+            cached.add(key)
 
     def list(self, prefix: str):
-        bucket, key_prefix = self._parse_s3_path(prefix)
+        bucket, key_prefix = _parse_s3_path(prefix)
         paginator = self.s3.get_paginator("list_objects_v2")
         results = []
         for page in paginator.paginate(Bucket=bucket, Prefix=key_prefix):
@@ -216,35 +444,69 @@ class BatchIngestionRunner:
         self.options = config.options or {}
         self.max_retries = int(self.options.get("max_retries", 3))
         self.overwrite = bool(self.options.get("overwrite", False))
+        # scratch space for staged sources and transform output (None = system default temp dir)
+        self.tmp_dir = self.options.get("tmp_dir")
+        # optional transform.schema ({column: arrow type alias, e.g. "int64", "string", "timestamp[ms]"});
+        # typed columns skip inference and pin the Arrow engine
+        self.column_types = None
+        schema = (self.config.transform or {}).get("schema")
+        if schema:
+            if pa is None:
+                raise RuntimeError("transform.schema requires pyarrow")
+            self.column_types = {name: pa.type_for_alias(str(t)) for name, t in schema.items()}
+        if self.tmp_dir:
+            os.makedirs(self.tmp_dir, exist_ok=True)
+        # codec for the compressed-CSV fallback: "gzip" (default) or "zstd"
+        self.compression = str((self.config.transform or {}).get("compression", "gzip")).lower()
+        if self.compression not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported transform.compression: {self.compression}")
+        if self.compression == "zstd" and zstandard is None:
+            raise RuntimeError("transform.compression=zstd requires the zstandard package")
+        self._compressed_suffix = ".csv.zst" if self.compression == "zstd" else ".csv.gz"
 
         # Choose adapters based on config
         self.source_adapter = self._adapter_for(self.config.source)
         self.dest_adapter = self._adapter_for(self.config.destination)
 
+        # Destination key template ("%s" = source file stem), resolved once instead of per source
+        dest = self.config.destination
+        self._dest_is_s3 = dest.get("type") == "s3"
+        if self._dest_is_s3:
+            self._dest_bucket = dest.get("s3_bucket")
+            key_prefix = dest.get("s3_key_prefix") or dest.get("local_path") or ""
+            if key_prefix and not key_prefix.endswith("/"):
+                key_prefix += "/"
+            self._dest_prefix = f"s3://{self._dest_bucket}/{key_prefix}"
+        else:
+            self._dest_bucket = None
+            self._dest_prefix = dest.get("s3_key_prefix") or dest.get("local_path") or "."
+            os.makedirs(self._dest_prefix, exist_ok=True)
+            self._dest_prefix = os.path.join(self._dest_prefix, "")
+        self._dest_fmt = self._dest_prefix.replace("%", "%%") + "%s.parquet"
+
     def _adapter_for(self, spec: Dict[str, Any]) -> StorageAdapter:
         t = spec.get("type", "local")
         if t == "s3":
-            return S3StorageAdapter()
+            return S3StorageAdapter(max_retries=self.max_retries)
         return LocalStorageAdapter()
 
     def _local_temp(self, suffix: str = "") -> str:
-        fd, path = tempfile.mkstemp(suffix=suffix)
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=self.tmp_dir)
         os.close(fd)
         return path
 
+    def _destination_prefix(self) -> str:
+        return self._dest_prefix
+
     def _derive_destination_key(self, source_path: str) -> str:
         # Simple idempotency: use source filename with .parquet under destination prefix
-        src_name = os.path.basename(source_path)
-        dest_prefix = self.config.destination.get("s3_key_prefix") or self.config.destination.get("local_path") or ""
-        dest_name = os.path.splitext(src_name)[0] + ".parquet"
-        if self.config.destination.get("type") == "s3":
-            # ensure prefix ends with /
-            if dest_prefix and not dest_prefix.endswith("/"):
-                dest_prefix = dest_prefix + "/"
-            return f"s3://{self.config.destination.get('s3_bucket')}/{dest_prefix}{dest_name}"
-        else:
-            os.makedirs(dest_prefix or ".", exist_ok=True)
-            return os.path.join(dest_prefix or ".", dest_name)
+        i = source_path.rfind("/")
+        if os.sep != "/":
+            i = max(i, source_path.rfind(os.sep))
+        name = source_path[i + 1:]
+        j = name.rfind(".")
+        stem = name[:j] if j > 0 else name
+        return self._dest_fmt % stem
 
     def run_once(self):
         # Determine source path(s)
@@ -261,7 +523,33 @@ class BatchIngestionRunner:
             source_path = src.get("local_path")
             if not source_path:
                 raise ValueError("local source requires local_path")
-
+        return self._ingest(source_path)
+
+    def run_many(self, sources: List[str]) -> List[Dict[str, Any]]:
+        """
+        Ingest many source paths (e.g. from source_adapter.list()) concurrently.
+
+        Uses a thread pool sized by options.concurrency (default 16): transfers are I/O-bound and the
+        polars/arrow transforms run in native code outside the GIL. A failing source does not stop the
+        others; results are returned in input order, each tagged with its source.
+        """
+        workers = max(1, int(self.options.get("concurrency", 16)))
+        # one listing of the destination replaces a HEAD per source in the idempotency check
+        self.dest_adapter.prewarm(self._destination_prefix())
+        results: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._ingest, s): s for s in sources}
+            for fut in as_completed(futures):
+                source_path = futures[fut]
+                try:
+                    results[source_path] = {"source": source_path, **fut.result()}
+                except Exception as e:
+                    logger.error("Ingestion failed for %s: %s", source_path, e)
+                    results[source_path] = {"source": source_path, "status": "failed", "error": str(e)}
+        return [results[s] for s in sources]
+
+    def _ingest(self, source_path: str) -> Dict[str, Any]:
+        """Download/stream -> transform -> upload a single source path."""
         dest_path = self._derive_destination_key(source_path)
         logger.info("Source: %s, Destination: %s", source_path, dest_path)
 
@@ -270,51 +558,188 @@ class BatchIngestionRunner:
             logger.info("Destination %s exists and overwrite is false — skipping", dest_path)
             return {"status": "skipped", "dest": dest_path}
 
-        # Download source to temp
+        tmp_src = tmp_out = None
+        try:
+            # Transform without staging the source where possible: local files are read in place,
+            # S3 objects are streamed straight into the Arrow CSV reader (S3 destinations via a spooled buffer)
+            if source_path.startswith("s3://"):
+                if pa_csv is not None:
+                    done, tmp_out, tmp_src = self._stream_s3_source(source_path, dest_path)
+                    if done:
+                        logger.info("Ingestion successful: %s", dest_path)
+                        return {"status": "success", "dest": dest_path}
+                else:
+                    tmp_src = self._stage_s3_source(source_path)
+                local_src = tmp_src
+            else:
+                local_src = source_path
+                if pa_csv is not None and self._dest_is_s3 and self._ingest_spooled(local_src, source_path, dest_path):
+                    logger.info("Ingestion successful: %s", dest_path)
+                    return {"status": "success", "dest": dest_path}
+
+            if tmp_out is None:
+                tmp_out = self._transform(local_src)
+
+            # Upload
+            try:
+                self.dest_adapter.publish(tmp_out, dest_path)
+            except Exception:
+                logger.exception("Failed to upload to destination %s", dest_path)
+                raise
+        finally:
+            # cleanup
+            for p in (tmp_src, tmp_out):
+                try:
+                    if p and os.path.exists(p):
+                        os.remove(p)
+                except Exception:
+                    logger.warning("Failed to cleanup temp file %s", p)
+
+        logger.info("Ingestion successful: %s", dest_path)
+        return {"status": "success", "dest": dest_path}
+
+    def _ingest_spooled(self, source: Any, source_path: str, dest_path: str) -> bool:
+        """
+        Arrow transform of source (a path or readable binary file object) into a SpooledTemporaryFile
+        (memory up to SPOOL_MAX_BYTES, then tmp_dir) uploaded with upload_fileobj.
+        Returns False if the transform failed and the file-based path should run instead.
+        """
+        delimiter = (self.config.transform or {}).get("csv", {}).get("delimiter", ",")
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, dir=self.tmp_dir) as buf:
+            try:
+                logger.info("Streaming CSV %s -> Parquet buffer", source_path)
+                self._write_parquet_arrow(source, delimiter, buf)
+            except Exception as e:
+                # with explicit types only a transfer error (not a data error) is worth another attempt
+                if self.column_types and not isinstance(e, _S3_ERRORS):
+                    raise
+                logger.warning("Streaming transform failed for %s; falling back to file-based transform", source_path, exc_info=True)
+                return False
+            try:
+                self.dest_adapter.upload_fileobj(buf, dest_path)
+            except Exception:
+                logger.exception("Failed to upload to destination %s", dest_path)
+                raise
+        return True
+
+    def _stream_s3_source(self, source_path: str, dest_path: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Stream the source object into the Arrow transform without staging it on disk. The first
+        SPOOL_MAX_BYTES read are kept in memory, so when the streaming transform fails a small object is
+        staged from that copy plus the rest of the stream; larger objects, and streams that broke with a
+        transfer error, are downloaded again with retries.
+
+        Returns (True, None, None) when the output was already uploaded (S3 destination),
+        (False, out_path, None) when a local Parquet file was produced, or (False, None, src_path)
+        when the source was staged to src_path for _transform.
+        """
+        delimiter = (self.config.transform or {}).get("csv", {}).get("delimiter", ",")
+        body = self.source_adapter.stream_source(source_path)
+        try:
+            tee = _TeeReader(body, SPOOL_MAX_BYTES)
+            if self._dest_is_s3:
+                if self._ingest_spooled(tee, source_path, dest_path):
+                    return True, None, None
+            else:
+                try:
+                    return False, self._transform_arrow(tee, delimiter), None
+                except Exception as e:
+                    if self.column_types and not isinstance(e, _S3_ERRORS):
+                        raise
+                    logger.warning("Streaming transform failed for %s; falling back to file-based transform", source_path, exc_info=True)
+            return False, None, self._stage_s3_source(source_path, tee)
+        finally:
+            body.close()
+
+    def _stage_s3_source(self, source_path: str, tee: Optional[_TeeReader] = None) -> str:
+        """
+        Copy the source object to a local temp file: from tee's copy and the rest of its stream when that
+        is still usable, otherwise with the adapter's retried download().
+        """
         tmp_src = self._local_temp(suffix=os.path.splitext(source_path)[1] or "")
         try:
-            self.source_adapter.download(source_path, tmp_src)
+            staged = False
+            if tee is not None and not (tee.overflowed or tee.failed):
+                try:
+                    with open(tmp_src, "wb") as fh:
+                        tee.stage(fh)
+                    staged = True
+                except _S3_ERRORS as e:
+                    logger.warning("Stream of %s failed (%s); downloading it instead", source_path, e)
+            if not staged:
+                self.source_adapter.download(source_path, tmp_src)
         except Exception:
             logger.exception("Failed to download source %s", source_path)
+            os.remove(tmp_src)
             raise
-
-        # Transform
+        return tmp_src
+
+    def _transform_polars(self, local_src_path: str, delimiter: str) -> str:
+        """
+        Stream CSV -> Parquet with Polars' streaming sink; row groups are written as the scan proceeds.
+        Not used with transform.schema, which only the Arrow engine applies.
+        """
+        out_path = self._local_temp(suffix=".parquet")
+        logger.info("Streaming CSV %s -> Parquet %s (polars)", local_src_path, out_path)
         try:
-            tmp_out = self._transform(tmp_src)
+            pl.scan_csv(local_src_path, separator=delimiter).sink_parquet(out_path, **POLARS_PARQUET_OPTIONS)
         except Exception:
-            logger.exception("Transform failed for %s", tmp_src)
+            os.remove(out_path)
             raise
+        return out_path
 
-        # Upload
+    def _transform_arrow(self, source: Any, delimiter: str) -> str:
+        """Stream CSV (a path or readable binary file object) -> Parquet one record batch at a time."""
+        out_path = self._local_temp(suffix=".parquet")
+        logger.info("Streaming CSV %s -> Parquet %s", getattr(source, "name", source), out_path)
         try:
-            self.dest_adapter.upload(tmp_out, dest_path)
+            self._write_parquet_arrow(source, delimiter, out_path)
         except Exception:
-            logger.exception("Failed to upload to destination %s", dest_path)
+            os.remove(out_path)
             raise
-        finally:
-            # cleanup
-            for p in (tmp_src, tmp_out):
-                try:
-                    if os.path.exists(p):
-                        os.remove(p)
-                except Exception:
-                    logger.warning("Failed to cleanup temp file %s", p)
+        return out_path
 
-        logger.info("Ingestion successful: %s", dest_path)
-        return {"status": "success", "dest": dest_path}
+    def _write_parquet_arrow(self, source: Any, delimiter: str, sink: Any) -> None:
+        """Convert CSV from source (path or binary file object) into Parquet at sink (path or writable file object)."""
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(column_types=self.column_types or {}),
+        )
+        with pq.ParquetWriter(sink, reader.schema, **PARQUET_OPTIONS) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
 
     def _transform(self, local_src_path: str) -> str:
         """Transform CSV -> Parquet (if possible). Return local path to output file."""
         transform_spec = self.config.transform or {}
         csv_spec = transform_spec.get("csv", {})
         delimiter = csv_spec.get("delimiter", ",")
+        if self.column_types:
+            # explicit types: a conversion failure is a data error, not a reason to re-infer with another engine
+            return self._transform_arrow(local_src_path, delimiter)
+        if pl is not None:
+            try:
+                return self._transform_polars(local_src_path, delimiter)
+            except Exception:
+                if pa_csv is None and pd is None:
+                    raise
+                logger.warning("Polars streaming transform failed for %s; falling back", local_src_path, exc_info=True)
+        if pa_csv is not None:
+            try:
+                return self._transform_arrow(local_src_path, delimiter)
+            except Exception:
+                if pd is None:
+                    raise
+                # e.g. a column whose inferred type changes after the first block
+                logger.warning("Streaming Arrow transform failed for %s; falling back to pandas", local_src_path, exc_info=True)
         if pd is None:
             # No pandas installed — fallback to copying file (compress)
-            logger.warning("pandas not available; performing passthrough copy (gz)")
-            out_path = local_src_path + ".gz"
-            import gzip
-            with open(local_src_path, "rb") as fr, gzip.open(out_path, "wb") as fw:
-                fw.write(fr.read())
+            logger.warning("pandas not available; performing passthrough copy (%s)", self.compression)
+            out_path = self._local_temp(suffix=self._compressed_suffix)
+            with open(local_src_path, "rb") as fr, self._open_compressed(out_path) as fw:
+                shutil.copyfileobj(fr, fw, 1 << 20)
             return out_path
 
         # Read CSV
@@ -326,28 +751,38 @@ class BatchIngestionRunner:
             raise
 
         # Simple schema checks & cast safety can be added here
-        out_path = self._local_temp(suffix=".parquet" if _parquet_available else ".csv.gz")
+        out_path = self._local_temp(suffix=".parquet" if _parquet_available else self._compressed_suffix)
         if _parquet_available:
             logger.info("Writing Parquet to %s", out_path)
             try:
-                df.to_parquet(out_path, index=False)
+                if pa is not None:
+                    df.to_parquet(out_path, index=False, engine="pyarrow", **PARQUET_OPTIONS)
+                else:
+                    df.to_parquet(out_path, index=False)
             except Exception:
-                logger.exception("Failed to write parquet, falling back to gz CSV")
-                import gzip
-                out_path = self._local_temp(suffix=".csv.gz")
-                with gzip.open(out_path, "wb") as fw:
-                    fw.write(df.to_csv(index=False).encode("utf-8"))
+                logger.exception("Failed to write parquet, falling back to compressed CSV")
+                out_path = self._local_temp(suffix=self._compressed_suffix)
+                self._write_compressed_csv(df, out_path)
         else:
-            logger.warning("Parquet backend not available; writing gzipped CSV to %s", out_path)
-            import gzip
-            with gzip.open(out_path, "wb") as fw:
-                fw.write(df.to_csv(index=False).encode("utf-8"))
+            logger.warning("Parquet backend not available; writing compressed CSV to %s", out_path)
+            self._write_compressed_csv(df, out_path)
         return out_path
 
+    def _open_compressed(self, out_path: str) -> BinaryIO:
+        """Binary writer for out_path using the configured fallback codec."""
+        if self.compression == "zstd":
+            cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+            return cctx.stream_writer(open(out_path, "wb"), closefd=True)
+        return _gzip.open(out_path, "wb", compresslevel=GZIP_LEVEL)
+
+    def _write_compressed_csv(self, df, out_path: str) -> None:
+        with io.TextIOWrapper(self._open_compressed(out_path), encoding="utf-8", newline="") as fw:
+            df.to_csv(fw, index=False, chunksize=CSV_WRITE_CHUNK_ROWS)
+
 
 def load_config(path: str) -> PipelineConfig:
     with open(path, "r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YamlLoader)
     return PipelineConfig.from_dict(raw)
 
 
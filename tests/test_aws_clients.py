@@ -56,6 +56,21 @@ def test_s3_download_to_bytesio_reads_object():
         assert bio.read() == body_bytes
 
 
+def test_s3_download_to_buffer_reuses_caller_buffer():
+    mock_body = MagicMock()
+    mock_body.iter_chunks.return_value = [b"file-", b"bytes"]
+    mock_s3 = MagicMock()
+    mock_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 10}
+
+    with patch("boto3.client", return_value=mock_s3):
+        s3 = S3Client(bucket="test-bucket")
+        out = bytearray(16)
+        view = s3.download_to_buffer(key="obj.bin", out=out)
+        assert bytes(view) == b"file-bytes"
+        assert view.obj is out
+        assert s3.download_to_buffer(key="obj.bin", out=bytearray(4)).obj is not out
+
+
 def test_s3_list_objects_paginates_and_returns_contents():
     page1 = {"Contents": [{"Key": "a"}], "IsTruncated": True}
     page2 = {"Contents": [{"Key": "b"}], "IsTruncated": False}
@@ -130,3 +145,30 @@ def test_dynamo_query_and_scan_return_items():
         assert isinstance(items_q, list) and len(items_q) == 2
         items_s = dyn.scan()
         assert isinstance(items_s, list) and len(items_s) == 1
+
+
+def test_s3_head_object_returns_none_for_missing_key():
+    import botocore
+    mock_s3 = MagicMock()
+    mock_s3.head_object.side_effect = [
+        {"ContentLength": 3},
+        botocore.exceptions.ClientError({"Error": {"Code": "404"}}, "HeadObject"),
+    ]
+    with patch("boto3.client", return_value=mock_s3):
+        s3 = S3Client(bucket="test-bucket")
+        assert s3.head_object(key="a") == {"ContentLength": 3}
+        assert s3.head_object(key="missing") is None
+        mock_s3.head_object.assert_called_with(Bucket="test-bucket", Key="missing")
+
+
+def test_s3_delete_objects_sends_one_request():
+    mock_s3 = MagicMock()
+    mock_s3.delete_objects.return_value = {"Errors": []}
+    with patch("boto3.client", return_value=mock_s3):
+        s3 = S3Client(bucket="test-bucket")
+        assert s3.delete_objects(["a", "b"]) == {"Errors": []}
+        mock_s3.delete_objects.assert_called_once_with(
+            Bucket="test-bucket", Delete={"Objects": [{"Key": "a"}, {"Key": "b"}], "Quiet": True}
+        )
+        with pytest.raises(ValueError):
+            s3.delete_objects([str(i) for i in range(1001)])
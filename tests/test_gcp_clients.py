@@ -0,0 +1,234 @@
+"""
+Unit tests for the gcp.* client wrappers.
+
+The google-cloud libraries are replaced with MagicMocks so these run without
+them installed; they assert our wrappers' own logic (buffer sizing, caching,
+batching, file handling) rather than the Google APIs.
+"""
+
+from __future__ import annotations
+import base64
+import json
+import os
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcp.iam_client import GCPIAM
+import gcp.bigquery_client as bigquery_client
+import gcp.secret_manager_client as secret_manager_client
+import gcp.storage_client as storage_client
+
+
+@pytest.fixture
+def gcs(monkeypatch):
+    monkeypatch.setattr(storage_client, "storage", MagicMock())
+    client = MagicMock()
+    return storage_client.GCSClient(bucket="test-bucket", client=client), client
+
+
+def _fake_blob(stored: bytes, content: bytes, content_encoding=None):
+    """Blob whose metadata describes `stored` bytes and whose download yields `content`."""
+    blob = MagicMock()
+    blob.size = len(stored)
+    blob.generation = 7
+    blob.content_encoding = content_encoding
+
+    def download_to_file(fileobj, start=None, end=None, **kwargs):
+        fileobj.write(content if start is None else content[start:end + 1])
+
+    blob.download_to_file.side_effect = download_to_file
+    return blob
+
+
+def test_gcs_download_to_buffer_fills_reused_buffer(gcs):
+    client, gclient = gcs
+    blob = _fake_blob(b"hello", b"hello")
+    gclient.bucket.return_value.blob.return_value = blob
+
+    out = bytearray(16)
+    view = client.download_to_buffer("obj", out=out)
+    assert bytes(view) == b"hello"
+    assert view.obj is out
+    assert blob.download_to_file.call_args[1]["if_generation_match"] == 7
+
+
+def test_gcs_download_to_buffer_handles_gzip_content_encoding(gcs):
+    client, gclient = gcs
+    # stored (compressed) size is smaller than the decoded bytes download_to_file produces
+    blob = _fake_blob(b"x" * 4, b"decompressed payload", content_encoding="gzip")
+    gclient.bucket.return_value.blob.return_value = blob
+
+    assert bytes(client.download_to_buffer("obj")) == b"decompressed payload"
+    assert client.download_to_bytesio("obj").getvalue() == b"decompressed payload"
+
+
+def test_gcs_download_parallel_ranges_and_encoded_fallback(gcs):
+    client, gclient = gcs
+    payload = bytes(range(256)) * 40  # 10 KiB
+    bucket = gclient.bucket.return_value
+    bucket.blob.side_effect = lambda key, generation=None: plain
+    plain = _fake_blob(payload, payload)
+
+    assert bytes(client.download_parallel("obj", concurrency=4, chunk=1024)) == payload
+    ranged = [c for c in plain.download_to_file.call_args_list if "start" in c[1]]
+    assert len(ranged) == 10
+
+    # ranges of a gzip-encoded object refer to the stored bytes, so it is read in one stream
+    plain = _fake_blob(b"x" * 4096, payload, content_encoding="gzip")
+    assert bytes(client.download_parallel("obj", concurrency=4, chunk=1024)) == payload
+    assert all("start" not in c[1] for c in plain.download_to_file.call_args_list)
+
+
+@pytest.fixture
+def secrets(monkeypatch):
+    monkeypatch.setattr(secret_manager_client, "secretmanager", MagicMock())
+    client = MagicMock()
+    client.access_secret_version.side_effect = lambda name: MagicMock(payload=MagicMock(data=f"value:{name}".encode()))
+    return secret_manager_client.GCPSecretManager(project="p", client=client, cache_maxsize=2), client
+
+
+def test_secret_cache_hits_and_invalidate(secrets):
+    sm, client = secrets
+    assert sm.access_secret("db") == "value:projects/p/secrets/db/versions/latest"
+    assert sm.access_secret("db") == "value:projects/p/secrets/db/versions/latest"
+    assert client.access_secret_version.call_count == 1
+
+    sm.invalidate("db")
+    sm.access_secret("db")
+    assert client.access_secret_version.call_count == 2
+
+
+def test_secret_pinned_cache_is_bounded(secrets):
+    sm, client = secrets
+    for version in ("1", "2", "3"):
+        sm.access_secret("db", version=version)
+    assert len(sm._pinned_cache) == 2
+    sm.access_secret("db", version="3")
+    assert client.access_secret_version.call_count == 3
+
+
+def test_secret_fetch_is_single_flight_and_outside_the_lock(secrets):
+    sm, client = secrets
+    release = threading.Event()
+    sm.access_secret("other")  # cached before the slow fetch starts
+
+    def slow(name):
+        release.wait(5)
+        return MagicMock(payload=MagicMock(data=b"slow"))
+
+    client.access_secret_version.side_effect = slow
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(sm.access_secret, "db") for _ in range(4)]
+        # a cache hit for another secret is served while the fetch is in flight
+        assert sm.access_secret("other") == "value:projects/p/secrets/other/versions/latest"
+        release.set()
+        assert [f.result() for f in futures] == ["slow"] * 4
+    assert client.access_secret_version.call_count == 2
+
+
+def _response(payload, status=200):
+    resp = MagicMock(ok=status < 400, status_code=status, text=json.dumps(payload))
+    resp.content = json.dumps(payload).encode()
+    resp.json.return_value = payload
+    return resp
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_iam_key_file_is_owner_only(tmp_path):
+    key_path = tmp_path / "key.json"
+    key_path.write_text("old")
+    os.chmod(key_path, 0o644)
+    http = MagicMock()
+    key_json = json.dumps({"private_key": "secret"})
+    http.request.return_value = _response({"name": "keys/1", "privateKeyData": base64.b64encode(key_json.encode()).decode()})
+
+    res = GCPIAM(session=http).create_service_account_key("sa@p.iam.gserviceaccount.com", str(key_path), dry_run=False)
+    assert res["rc"] == 0
+    assert "secret" not in res["stdout"]
+    assert key_path.read_text() == key_json
+    assert stat.S_IMODE(key_path.stat().st_mode) == 0o600
+
+
+def test_iam_add_bindings_merges_into_one_policy_write():
+    http = MagicMock()
+    policy = {"etag": "e1", "bindings": [{"role": "roles/viewer", "members": ["user:a@x.com"]}]}
+    http.request.side_effect = [_response(policy), _response({"etag": "e2"})]
+
+    res = GCPIAM(session=http).add_iam_policy_bindings(
+        "p", [("user:b@x.com", "roles/viewer"), ("user:a@x.com", "roles/viewer"), ("user:b@x.com", "roles/editor")],
+        dry_run=False,
+    )
+    assert res["rc"] == 0
+    assert http.request.call_count == 2
+    written = http.request.call_args[1]["json"]["policy"]
+    assert written["etag"] == "e1"
+    assert written["bindings"] == [
+        {"role": "roles/viewer", "members": ["user:a@x.com", "user:b@x.com"]},
+        {"role": "roles/editor", "members": ["user:b@x.com"]},
+    ]
+
+
+class _FakeQueryJobConfig:
+    def __init__(self, use_query_cache=None, destination=None):
+        self.use_query_cache = use_query_cache
+        self.destination = destination
+
+    def to_api_repr(self):
+        return {"query": {"useQueryCache": self.use_query_cache, "destinationTable": self.destination}}
+
+
+@pytest.fixture
+def bq(monkeypatch):
+    monkeypatch.setattr(bigquery_client, "bigquery", MagicMock(QueryJobConfig=_FakeQueryJobConfig))
+    client = MagicMock()
+    jobs = {}
+
+    def query(sql, job_config=None):
+        job = MagicMock(job_id=f"job-{len(jobs)}", statement_type="SELECT", state="DONE", error_result=None,
+                        ended=datetime.now(timezone.utc))
+        jobs[job.job_id] = job
+        return job
+
+    client.query.side_effect = query
+    client.get_job.side_effect = lambda job_id: jobs[job_id]
+    return bigquery_client.BigQueryClient(project="p", client=client), client
+
+
+def test_bigquery_job_reuse_is_opt_in(bq):
+    bqc, client = bq
+    first = bqc.run_query("SELECT 1")
+    # default: every call submits a fresh job
+    assert bqc.run_query("SELECT 1") != first
+    assert client.query.call_count == 2
+    # opt-in: an identical recent SELECT is handed back
+    assert bqc.run_query("SELECT 1", reuse_job=True) == "job-1"
+    assert client.query.call_count == 2
+
+
+def test_bigquery_never_reuses_selects_with_a_destination(bq):
+    bqc, client = bq
+    job_config = _FakeQueryJobConfig(destination="p.ds.table")
+    bqc.run_query("SELECT 1", job_config=job_config, reuse_job=True)
+    bqc.run_query("SELECT 1", job_config=job_config, reuse_job=True)
+    assert client.query.call_count == 2
+
+
+def test_gcs_delete_blobs_reports_per_key(gcs):
+    client, gclient = gcs
+    blobs = {}
+
+    def blob(key, generation=None):
+        b = blobs.setdefault(key, MagicMock())
+        if key == "missing":
+            b.delete.side_effect = storage_client.GoogleAPICallError("404 No such object")
+        return b
+
+    gclient.bucket.return_value.blob.side_effect = blob
+    assert client.delete_blobs(["a", "missing", "b"]) == [True, False, True]
+    assert all(blobs[k].delete.call_count == 1 for k in ("a", "missing", "b"))
@@ -0,0 +1,76 @@
+"""
+Unit tests for mcp_server tool helpers.
+
+Terraform is never executed: run_cmd is replaced with a recorder, so these
+check the wrapper logic (var files, init caching) around the commands.
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+import mcp_server
+from tools.runner import CommandResult
+
+
+def _tool(obj):
+    # FastMCP's decorator wraps the function in a tool object that keeps it as .fn
+    return getattr(obj, "fn", obj)
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    calls = []
+
+    def fake_run_cmd(cmd, cwd=None, dry_run=False, **kwargs):
+        calls.append(list(cmd))
+        if "-var-file" in cmd:
+            with open(cmd[cmd.index("-var-file") + 1], encoding="utf-8") as fh:
+                calls[-1].append(json.load(fh))
+        return CommandResult(returncode=0, stdout="", stderr="", cmd=" ".join(cmd), cwd=cwd)
+
+    monkeypatch.setattr(mcp_server, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(mcp_server, "_INIT_CACHE", {})
+    return calls
+
+
+def test_apply_terraform_passes_vars_file_and_removes_it(tmp_path, monkeypatch, commands):
+    monkeypatch.setattr(mcp_server.tempfile, "tempdir", str(tmp_path))
+    res = asyncio.run(_tool(mcp_server.apply_terraform)("aws", "dev", vars={"count": 2, "name": "x"}))
+    assert res["succeeded"]
+    plan = commands[1]
+    assert plan[:2] == ["terraform", "plan"] and plan[-1] == {"count": 2, "name": "x"}
+    assert os.listdir(tmp_path) == []
+
+
+def test_apply_terraform_removes_vars_file_when_serialization_fails(tmp_path, monkeypatch, commands):
+    monkeypatch.setattr(mcp_server.tempfile, "tempdir", str(tmp_path))
+    with pytest.raises(TypeError):
+        asyncio.run(_tool(mcp_server.apply_terraform)("aws", "dev", vars={"bad": object()}))
+    assert os.listdir(tmp_path) == []
+    assert commands == []
+
+
+def test_terraform_init_reruns_when_config_changes(tmp_path, commands):
+    tf_dir = str(tmp_path)
+    (tmp_path / ".terraform.lock.hcl").write_text("# providers\n")
+    (tmp_path / ".terraform").mkdir()
+    main_tf = tmp_path / "main.tf"
+    main_tf.write_text('module "a" { source = "./a" }\n')
+
+    mcp_server._terraform_init(tf_dir, dry_run=False)
+    assert mcp_server._terraform_init(tf_dir, dry_run=False).stdout.startswith("[cached]")
+    assert len(commands) == 1
+
+    main_tf.write_text('module "a" { source = "./b" }\n')
+    mcp_server._terraform_init(tf_dir, dry_run=False)
+    assert len(commands) == 2
+    (tmp_path / "backend.tf").write_text('terraform { backend "s3" {} }\n')
+    mcp_server._terraform_init(tf_dir, dry_run=False)
+    assert len(commands) == 3
+    assert mcp_server._terraform_init(tf_dir, dry_run=False).stdout.startswith("[cached]")
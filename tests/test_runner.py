@@ -0,0 +1,120 @@
+"""
+Unit tests for tools.runner.run_cmd.
+
+These run small Python child processes to check output capture, exit codes,
+timeouts, the dry_run fast path, concurrent batches and the asyncio variant.
+"""
+
+from __future__ import annotations
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from tools.runner import run_cmd, run_cmd_async, run_cmd_batch
+
+
+def test_run_cmd_captures_stdout_and_stderr():
+    code = "import sys; sys.stdout.write('x' * 200000); sys.stderr.write('err\\r\\n'); sys.exit(3)"
+    res = run_cmd([sys.executable, "-c", code])
+    assert res.returncode == 3
+    assert res.stdout == "x" * 200000
+    assert res.stderr == "err\n"
+
+
+def test_run_cmd_timeout_returns_124():
+    code = "import sys, time; print('started', flush=True); time.sleep(10)"
+    res = run_cmd([sys.executable, "-c", code], timeout=1)
+    assert res.returncode == 124
+    assert res.stdout.startswith("started")
+
+
+def test_run_cmd_dry_run_does_not_execute():
+    res = run_cmd("terraform destroy -auto-approve", dry_run=True)
+    assert res.returncode == 0
+    assert res.stdout == "[dry_run] terraform destroy -auto-approve"
+
+
+def test_run_cmd_batch_preserves_order_and_overlaps():
+    code = "import sys, time; time.sleep(0.5); print(sys.argv[1])"
+    cmds = [[sys.executable, "-c", code, str(i)] for i in range(4)] + [[sys.executable, "-c", "import sys; sys.exit(2)"]]
+    start = time.monotonic()
+    results = run_cmd_batch(cmds, max_concurrency=5)
+    assert time.monotonic() - start < 1.5
+    assert [r.stdout for r in results[:4]] == [f"{i}\n" for i in range(4)]
+    assert results[4].returncode == 2
+
+
+def test_run_cmd_batch_per_command_timeout():
+    results = run_cmd_batch(
+        [[sys.executable, "-c", "import time; time.sleep(10)"], [sys.executable, "-c", "print('ok')"]],
+        max_concurrency=1,
+        timeout=1,
+    )
+    assert [r.returncode for r in results] == [124, 0]
+    assert results[1].stdout == "ok\n"
+
+
+def test_run_cmd_keeps_only_output_tail():
+    code = "import sys; sys.stdout.write('a' * 300000 + 'b' * 1000)"
+    res = run_cmd([sys.executable, "-c", code], max_output_bytes=2000)
+    assert res.returncode == 0
+    assert res.stdout == "a" * 1000 + "b" * 1000
+
+
+def test_run_cmd_async_runs_concurrently_and_times_out():
+    async def main():
+        sleeper = [sys.executable, "-c", "import time; time.sleep(0.5); print('done')"]
+        start = time.monotonic()
+        results = await asyncio.gather(*(run_cmd_async(sleeper) for _ in range(3)))
+        elapsed = time.monotonic() - start
+        timed_out = await run_cmd_async([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.5)
+        return results, elapsed, timed_out
+
+    results, elapsed, timed_out = asyncio.run(main())
+    assert [r.stdout for r in results] == ["done\n"] * 3
+    assert elapsed < 1.4
+    assert timed_out.returncode == 124
+
+
+def test_env_hash_is_stable_across_processes():
+    code = "from tools.runner import run_cmd; print(run_cmd('true', env={'B': '2', 'A': '1'}, dry_run=True).env_hash)"
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    hashes = {
+        run_cmd([sys.executable, "-c", code], cwd=repo_root, env={**os.environ, "PYTHONHASHSEED": seed}).stdout.strip()
+        for seed in ("1", "2")
+    }
+    res = run_cmd("true", env={"A": "1", "B": "2"}, dry_run=True)
+    assert hashes == {res.env_hash}
+    assert run_cmd("true", env={"A": "1", "B": "3"}, dry_run=True).env_hash != res.env_hash
+    assert res.env is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX fds and executables")
+def test_run_cmd_with_cwd_does_not_leak_inheritable_fds(tmp_path):
+    r, w = os.pipe()
+    try:
+        os.set_inheritable(w, True)  # as a C extension might leave it
+        code = f"import os, sys\ntry:\n    os.fstat({w})\nexcept OSError:\n    sys.exit(0)\nsys.exit(1)"
+        assert run_cmd([sys.executable, "-c", code], cwd=str(tmp_path)).returncode == 0
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX fds and executables")
+def test_which_cache_follows_moved_executables(tmp_path):
+    from tools import runner
+
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    tool = first / "mytool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+    path = os.pathsep.join([str(first), str(second)])
+    assert runner._which("mytool", path) == str(tool)
+    os.replace(tool, second / "mytool")
+    assert runner._which("mytool", path) == str(second / "mytool")
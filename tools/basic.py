@@ -0,0 +1,30 @@
+"""
+Basic example tools for the DataMCP FastMCP server.
+
+Purpose:
+- Single home for the trivial demo tools (say_hello, add_numbers) so every server entrypoint
+  registers the same definitions instead of carrying its own copies.
+
+Usage:
+    from fastmcp import FastMCP
+    from tools import basic
+    mcp = FastMCP("DataMCP")
+    basic.register(mcp)
+"""
+
+from __future__ import annotations
+from typing import Any
+
+
+def register(mcp: Any) -> None:
+    """Register the example tools on a FastMCP instance."""
+
+    @mcp.tool
+    def say_hello(name: str) -> str:
+        """Return a simple greeting."""
+        return f"Hello, {name}!"
+
+    @mcp.tool
+    def add_numbers(a: float, b: float) -> float:
+        """Return the sum of two numbers."""
+        return a + b
@@ -8,22 +8,25 @@ Usage:
 """
 
 import argparse
+import mmap
 import os
+import re
 import subprocess
 from pathlib import Path
 
+# KEY=VALUE lines; blank lines, "#" comments and lines without "=" never match.
+# Key and value are whitespace-trimmed and the value may itself contain "=".
+_ENV_RE = re.compile(rb"(?m)^[ \t]*([^#=\s][^=\r\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$")
+
 def load_env_file(path: Path):
     if not path.exists():
         return
-    with path.open() as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            os.environ.setdefault(k.strip(), v.strip())
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in _ENV_RE.finditer(mm):
+                os.environ.setdefault(m.group(1).decode(), m.group(2).decode())
 
 def main():
     parser = argparse.ArgumentParser()
@@ -34,10 +37,10 @@ def main():
     env_path = Path(args.env_file)
     load_env_file(env_path)
 
-    # Run the MCP server module in a subprocess forwarding env
+    # Run the MCP server module in a subprocess; it inherits os.environ (including the env file)
     cmd = [args.python, "mcp_server.py"]
     print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True, env=os.environ.copy())
+    subprocess.run(cmd, check=True)
 
 if __name__ == "__main__":
     main()
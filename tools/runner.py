@@ -6,18 +6,87 @@ Features:
 - capture stdout/stderr
 - return structured result
 - basic timeout support
+- run_cmd_batch to run independent commands concurrently
+- run_cmd_async for callers on an asyncio event loop
 - logging of commands (caller should handle storing audit logs)
 """
 
 from __future__ import annotations
+import asyncio
+import functools
+import hashlib
+import os
+import selectors
 import shlex
+import shutil
 import subprocess
 import logging
-from dataclasses import dataclass
-from typing import Optional, Sequence, Dict, Any
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Dict, Any, List, Tuple
 
 LOG = logging.getLogger(__name__)
 
+_READ_CHUNK = 64 * 1024  # bytes per os.read() when draining stdout/stderr
+_POSIX = os.name == "posix"  # selectors only support pipes on POSIX; Windows falls back to communicate()
+MAX_OUTPUT_BYTES = 1 << 20  # default tail of stdout/stderr kept per command
+
+
+# IaC tools are invoked with the same few command templates over and over; memoize the shell parsing.
+@functools.lru_cache(maxsize=2048)
+def _split(cmd: str) -> Tuple[str, ...]:
+    return tuple(shlex.split(cmd))
+
+
+@functools.lru_cache(maxsize=8192)
+def _quote(arg: str) -> str:
+    return shlex.quote(arg)
+
+
+_WHICH_TTL = 30.0  # seconds a PATH lookup is reused, so upgraded, moved or newly installed tools are picked up
+_WHICH_MAX = 256
+_which_cache: Dict[Tuple[str, Optional[str]], Tuple[float, str]] = {}
+
+
+def _which(name: str, path: Optional[str]) -> Optional[str]:
+    key = (name, path)
+    now = time.monotonic()
+    hit = _which_cache.get(key)
+    if hit is not None and now - hit[0] < _WHICH_TTL and os.access(hit[1], os.X_OK):
+        return hit[1]
+    resolved = shutil.which(name, path=path)
+    if resolved:
+        if len(_which_cache) >= _WHICH_MAX:
+            _which_cache.clear()
+        _which_cache[key] = (now, resolved)
+    return resolved
+
+
+def _close_fds(cwd: Optional[str]) -> bool:
+    """
+    Only skip the close_fds sweep where it buys posix_spawn (POSIX, no cwd). PEP 446 makes fds
+    Python opens non-inheritable, but C extensions (grpc, TLS backends) may leave inheritable
+    ones, so with a cwd -- where CPython uses fork/exec anyway -- keep closing them.
+    """
+    return not (_POSIX and cwd is None)
+
+
+def _resolve_executable(cmd_list: list, env: Optional[Dict[str, str]]) -> None:
+    """
+    Replace a bare program name with its absolute path (looked up on env's PATH when given).
+
+    An absolute executable, close_fds=False and no cwd/preexec_fn let CPython launch the
+    child with posix_spawn; otherwise it still uses vfork. Callers must not add preexec_fn.
+    """
+    if not cmd_list or os.sep in cmd_list[0] or (os.altsep and os.altsep in cmd_list[0]):
+        return
+    path = (env if env is not None else os.environ).get("PATH")
+    resolved = _which(cmd_list[0], path)
+    if resolved:
+        cmd_list[0] = resolved
+
 
 @dataclass
 class CommandResult:
@@ -26,7 +95,11 @@ class CommandResult:
     stderr: str
     cmd: str
     cwd: Optional[str] = None
-    env: Optional[Dict[str, str]] = None
+    # Deprecated: no longer populated (always None) so results don't keep the env dict alive; use env_hash.
+    # Kept for one release so callers reading result.env don't break; will be removed after that.
+    env: Optional[Dict[str, str]] = field(default=None, repr=False)
+    # stable fingerprint of the env passed in (blake2b hex of the sorted items; None = inherited)
+    env_hash: Optional[str] = None
 
 
 def run_cmd(
@@ -36,6 +109,7 @@ def run_cmd(
     dry_run: bool = False,
     timeout: Optional[int] = None,
     check: bool = False,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
 ) -> CommandResult:
     """
     Execute a command safely.
@@ -46,46 +120,319 @@ def run_cmd(
     - dry_run: if True, the command will not be executed; a simulated successful result is returned
     - timeout: seconds to wait before killing the process
     - check: if True, raise CalledProcessError on non-zero exit (subprocess.CalledProcessError)
+    - max_output_bytes: keep only the last this-many bytes of stdout and of stderr
     """
 
-    if isinstance(cmd, str):
-        cmd_list = shlex.split(cmd)
-        cmd_str = cmd
-    else:
-        cmd_list = list(cmd)
-        cmd_str = " ".join(shlex.quote(c) for c in cmd_list)
+    cmd_list, cmd_str = _prepare(cmd)
 
     LOG.debug("Running command (dry_run=%s): %s (cwd=%s)", dry_run, cmd_str, cwd)
 
     if dry_run:
         # Return a simulated success result with empty output to indicate what would be run.
-        return CommandResult(returncode=0, stdout=f"[dry_run] {cmd_str}", stderr="", cmd=cmd_str, cwd=cwd, env=env)
+        return CommandResult(returncode=0, stdout=f"[dry_run] {cmd_str}", stderr="", cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
 
+    _resolve_executable(cmd_list, env)
     try:
-        proc = subprocess.run(
-            cmd_list,
-            cwd=cwd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=timeout,
-            check=check,
-            text=True,
-        )
-        stdout = proc.stdout or ""
-        stderr = proc.stderr or ""
-        return CommandResult(returncode=proc.returncode, stdout=stdout, stderr=stderr, cmd=cmd_str, cwd=cwd, env=env)
-    except subprocess.CalledProcessError as exc:
-        # CalledProcessError contains returncode, stdout, stderr
-        out = getattr(exc, "stdout", "") or ""
-        err = getattr(exc, "stderr", "") or ""
-        LOG.error("Command failed: %s (rc=%s) stdout=%s stderr=%s", cmd_str, exc.returncode, out, err)
-        return CommandResult(returncode=exc.returncode or 1, stdout=out, stderr=err, cmd=cmd_str, cwd=cwd, env=env)
+        with subprocess.Popen(
+            cmd_list, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0, close_fds=_close_fds(cwd)
+        ) as proc:
+            try:
+                out_b, err_b = _communicate(proc, timeout, max_output_bytes)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                raise
+        return _completed(proc.returncode, out_b, err_b, cmd_str, cwd, env, check)
     except subprocess.TimeoutExpired as exc:
-        out = getattr(exc, "stdout", "") or ""
-        err = getattr(exc, "stderr", "") or ""
-        LOG.error("Command timed out: %s (timeout=%s)", cmd_str, timeout)
-        return CommandResult(returncode=124, stdout=out, stderr=(err or f"timeout after {timeout}s"), cmd=cmd_str, cwd=cwd, env=env)
+        return _timed_out(exc.output, exc.stderr, cmd_str, cwd, env, timeout)
     except Exception as exc:  # fallback
         LOG.exception("Unexpected error running command: %s", cmd_str)
-        return CommandResult(returncode=1, stdout="", stderr=str(exc), cmd=cmd_str, cwd=cwd, env=env)
+        return CommandResult(returncode=1, stdout="", stderr=str(exc), cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+
+
+async def run_cmd_async(
+    cmd: Sequence[str] | str,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    dry_run: bool = False,
+    timeout: Optional[int] = None,
+    check: bool = False,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
+) -> CommandResult:
+    """
+    Async counterpart of run_cmd: same arguments and CommandResult, but the event loop keeps
+    serving other tasks while the command runs (asyncio.create_subprocess_exec).
+
+    On timeout the process is killed and rc 124 is returned; unlike run_cmd, output produced
+    before the timeout is not kept.
+    """
+    cmd_list, cmd_str = _prepare(cmd)
+
+    LOG.debug("Running command async (dry_run=%s): %s (cwd=%s)", dry_run, cmd_str, cwd)
+
+    if dry_run:
+        return CommandResult(returncode=0, stdout=f"[dry_run] {cmd_str}", stderr="", cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+
+    _resolve_executable(cmd_list, env)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_list, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=_close_fds(cwd)
+        )
+        try:
+            out_b, err_b = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return _timed_out(None, None, cmd_str, cwd, env, timeout)
+        out_buf, err_buf = _Ring(max_output_bytes), _Ring(max_output_bytes)
+        out_buf.append(out_b or b"")
+        err_buf.append(err_b or b"")
+        return _completed(
+            proc.returncode, out_buf.getvalue(cmd_str, "stdout"), err_buf.getvalue(cmd_str, "stderr"), cmd_str, cwd, env, check
+        )
+    except Exception as exc:  # fallback
+        LOG.exception("Unexpected error running command: %s", cmd_str)
+        return CommandResult(returncode=1, stdout="", stderr=str(exc), cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+
+
+def run_cmd_batch(
+    cmds: Sequence[Sequence[str] | str],
+    max_concurrency: int = 8,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    dry_run: bool = False,
+    timeout: Optional[int] = None,
+    check: bool = False,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
+) -> List[CommandResult]:
+    """
+    Run independent commands with up to max_concurrency in flight; results keep the input order.
+
+    Arguments mean the same as for run_cmd and apply to every command; timeout is per command,
+    counted from its launch. On POSIX all pipes are drained from a single selector; elsewhere
+    each command runs through run_cmd on a thread pool.
+    """
+    max_concurrency = max(1, int(max_concurrency))
+    if dry_run or not _POSIX:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(lambda c: run_cmd(
+                c, cwd=cwd, env=env, dry_run=dry_run, timeout=timeout, check=check, max_output_bytes=max_output_bytes
+            ), cmds))
+
+    results: List[Optional[CommandResult]] = [None] * len(cmds)
+    pending = iter(enumerate(cmds))
+    running: Dict[int, _Job] = {}
+
+    def finish(job: _Job, timed_out: bool = False) -> None:
+        del running[job.idx]
+        if timed_out:
+            job.proc.kill()
+        for key in [k for k in sel.get_map().values() if k.data[0] is job]:
+            sel.unregister(key.fd)
+        try:
+            job.proc.wait(timeout=None if timed_out or job.deadline is None else max(job.deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            job.proc.kill()
+            job.proc.wait()
+            timed_out = True
+        job.proc.stdout.close()
+        job.proc.stderr.close()
+        out, err = job.out.getvalue(job.cmd_str, "stdout"), job.err.getvalue(job.cmd_str, "stderr")
+        if timed_out:
+            results[job.idx] = _timed_out(out, err, job.cmd_str, cwd, env, timeout)
+        else:
+            results[job.idx] = _completed(job.proc.returncode, out, err, job.cmd_str, cwd, env, check)
+
+    def launch() -> None:
+        while len(running) < max_concurrency:
+            nxt = next(pending, None)
+            if nxt is None:
+                return
+            idx, cmd = nxt
+            cmd_str = str(cmd)
+            try:
+                cmd_list, cmd_str = _prepare(cmd)
+                LOG.debug("Running command (batch): %s (cwd=%s)", cmd_str, cwd)
+                _resolve_executable(cmd_list, env)
+                proc = subprocess.Popen(
+                    cmd_list, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0, close_fds=_close_fds(cwd)
+                )
+            except Exception as exc:
+                LOG.exception("Unexpected error running command: %s", cmd_str)
+                results[idx] = CommandResult(returncode=1, stdout="", stderr=str(exc), cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+                continue
+            deadline = None if timeout is None else time.monotonic() + timeout
+            job = _Job(idx, proc, cmd_str, deadline, _Ring(max_output_bytes), _Ring(max_output_bytes))
+            for pipe, buf in ((proc.stdout, job.out), (proc.stderr, job.err)):
+                os.set_blocking(pipe.fileno(), False)
+                sel.register(pipe.fileno(), selectors.EVENT_READ, (job, buf))
+            running[idx] = job
+
+    with selectors.DefaultSelector() as sel:
+        launch()
+        while running:
+            now = time.monotonic()
+            for job in [j for j in running.values() if j.deadline is not None and j.deadline <= now]:
+                finish(job, timed_out=True)
+            if not running:
+                launch()
+                continue
+            deadlines = [j.deadline for j in running.values() if j.deadline is not None]
+            wait = max(min(deadlines) - now, 0) if deadlines else None
+            for key, _ in sel.select(wait):
+                job, buf = key.data
+                try:
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                except BlockingIOError:
+                    continue
+                if chunk:
+                    buf.append(chunk)
+                    continue
+                sel.unregister(key.fd)
+                job.open_pipes -= 1
+                if job.open_pipes == 0:
+                    finish(job)
+            launch()
+    return results  # type: ignore[return-value]
+
+
+@dataclass
+class _Job:
+    """A run_cmd_batch command in flight."""
+
+    idx: int
+    proc: subprocess.Popen
+    cmd_str: str
+    deadline: Optional[float]
+    out: _Ring
+    err: _Ring
+    open_pipes: int = 2
+
+
+class _Ring:
+    """Bounded byte buffer keeping the last `cap` bytes appended (older chunks are dropped)."""
+
+    __slots__ = ("cap", "chunks", "size", "dropped")
+
+    def __init__(self, cap: int):
+        self.cap = max(0, int(cap))
+        self.chunks: deque = deque()
+        self.size = 0
+        self.dropped = 0
+
+    def append(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size > self.cap:
+            head = self.chunks.popleft()
+            excess = self.size - self.cap
+            if len(head) > excess:
+                self.chunks.appendleft(head[excess:])
+                self.size -= excess
+                self.dropped += excess
+            else:
+                self.size -= len(head)
+                self.dropped += len(head)
+
+    def getvalue(self, cmd_str: Any = "", what: str = "output") -> bytes:
+        if self.dropped:
+            LOG.warning("Truncated %s of %s: kept last %d bytes, dropped %d", what, cmd_str, self.size, self.dropped)
+        return b"".join(self.chunks)
+
+
+def _prepare(cmd: Sequence[str] | str) -> Tuple[List[str], str]:
+    """Return (argv list, display string) for a command given as a list or shell string."""
+    if isinstance(cmd, str):
+        return list(_split(cmd)), cmd
+    cmd_list = list(cmd)
+    # every CommandResult carries this string, so it is always needed; _quote memoizes the per-arg work
+    return cmd_list, " ".join(map(_quote, cmd_list))
+
+
+def _completed(
+    returncode: int, out: bytes, err: bytes, cmd_str: str, cwd: Optional[str], env: Optional[Dict[str, str]], check: bool
+) -> CommandResult:
+    stdout = _decode(out)
+    stderr = _decode(err)
+    if check and returncode != 0 and LOG.isEnabledFor(logging.ERROR):
+        LOG.error("Command failed: %s (rc=%s) stdout=%s stderr=%s", cmd_str, returncode, _trunc(stdout), _trunc(stderr))
+    return CommandResult(returncode=returncode, stdout=stdout, stderr=stderr, cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+
+
+def _timed_out(
+    out: Optional[bytes], err: Optional[bytes], cmd_str: str, cwd: Optional[str], env: Optional[Dict[str, str]], timeout: Optional[int]
+) -> CommandResult:
+    LOG.error("Command timed out: %s (timeout=%s)", cmd_str, timeout)
+    stderr = _decode(err)
+    return CommandResult(returncode=124, stdout=_decode(out), stderr=(stderr or f"timeout after {timeout}s"), cmd=cmd_str, cwd=cwd, env_hash=_env_hash(env))
+
+
+def _env_hash(env: Optional[Dict[str, str]]) -> Optional[str]:
+    # not hash(): str hashes are salted per process (PYTHONHASHSEED), so they can't be logged or compared across runs
+    if not env:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for key, value in sorted(env.items()):
+        h.update(key.encode("utf-8", "surrogateescape") + b"\0" + value.encode("utf-8", "surrogateescape") + b"\0")
+    return h.hexdigest()
+
+
+def _trunc(text: str, limit: int = 4096) -> str:
+    """Clip text for log messages; the full output stays on the CommandResult."""
+    return text if len(text) <= limit else f"{text[:limit]}...[+{len(text) - limit} chars truncated]"
+
+
+def _decode(data: Optional[bytes]) -> str:
+    # universal newlines, matching what text=True used to give callers
+    if not data:
+        return ""
+    return data.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _communicate(proc: subprocess.Popen, timeout: Optional[float], max_output_bytes: int = MAX_OUTPUT_BYTES) -> Tuple[bytes, bytes]:
+    """
+    Drain proc's stdout/stderr to EOF and wait for it to exit.
+
+    On POSIX both pipes are read non-blocking in 64 KiB chunks into bounded _Ring buffers
+    via a selector, so output is decoded once by the caller rather than through text
+    wrappers and at most max_output_bytes of each stream is retained.
+    Raises subprocess.TimeoutExpired (carrying the output kept so far) past the deadline.
+    """
+    out_buf, err_buf = _Ring(max_output_bytes), _Ring(max_output_bytes)
+
+    def tails() -> Tuple[bytes, bytes]:
+        return out_buf.getvalue(proc.args, "stdout"), err_buf.getvalue(proc.args, "stderr")
+
+    if not _POSIX:
+        out, err = proc.communicate(timeout=timeout)
+        out_buf.append(out or b"")
+        err_buf.append(err or b"")
+        return tails()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    bufs = {proc.stdout.fileno(): out_buf, proc.stderr.fileno(): err_buf}
+    with selectors.DefaultSelector() as sel:
+        for fd in bufs:
+            os.set_blocking(fd, False)
+            sel.register(fd, selectors.EVENT_READ)
+        while sel.get_map():
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, timeout, *tails())
+            for key, _ in sel.select(remaining):
+                try:
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                except BlockingIOError:
+                    continue
+                if chunk:
+                    bufs[key.fd].append(chunk)
+                else:
+                    sel.unregister(key.fd)
+
+    remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+    try:
+        proc.wait(timeout=remaining)
+    except subprocess.TimeoutExpired:
+        raise subprocess.TimeoutExpired(proc.args, timeout, *tails())
+    return tails()